@@ -0,0 +1,44 @@
+"""06_story_jobs
+
+Revision ID: 06
+Revises: 05
+Create Date: 2025-10-05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '06'
+down_revision: Union[str, None] = '05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ALTER TYPE ... ADD VALUE cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE storystatus ADD VALUE IF NOT EXISTS 'PENDING'")
+        op.execute("ALTER TYPE storystatus ADD VALUE IF NOT EXISTS 'GENERATING'")
+        op.execute("ALTER TYPE storystatus ADD VALUE IF NOT EXISTS 'FAILED'")
+
+    op.add_column('stories', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('stories', sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('stories', sa.Column('error', sa.Text(), nullable=True))
+    op.create_index(
+        'ix_stories_job_queue',
+        'stories',
+        ['status', 'created_at'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('PENDING', 'GENERATING')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stories_job_queue', table_name='stories')
+    op.drop_column('stories', 'error')
+    op.drop_column('stories', 'claimed_at')
+    op.drop_column('stories', 'attempts')
+    # Postgres cannot drop enum values; remove rows that would not fit the old set
+    op.execute("DELETE FROM stories WHERE status IN ('PENDING', 'GENERATING', 'FAILED')")
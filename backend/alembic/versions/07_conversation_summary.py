@@ -0,0 +1,26 @@
+"""07_conversation_summary
+
+Revision ID: 07
+Revises: 06
+Create Date: 2025-10-05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '07'
+down_revision: Union[str, None] = '06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('conversation_sessions', sa.Column('summary', sa.Text(), nullable=True))
+    op.add_column('conversation_sessions', sa.Column('summary_through', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('conversation_sessions', 'summary_through')
+    op.drop_column('conversation_sessions', 'summary')
@@ -0,0 +1,56 @@
+"""08_message_sequence_counter
+
+Revision ID: 08
+Revises: 07
+Create Date: 2025-10-05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '08'
+down_revision: Union[str, None] = '07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Renumber sequences that collided under concurrent turns
+    op.execute("""
+        UPDATE conversation_messages AS m
+        SET sequence_number = r.rn
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY session_id ORDER BY sequence_number, created_at, id
+            ) AS rn
+            FROM conversation_messages
+        ) AS r
+        WHERE m.id = r.id AND m.sequence_number <> r.rn
+    """)
+
+    op.add_column('conversation_sessions', sa.Column('message_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute("""
+        UPDATE conversation_sessions AS s
+        SET message_count = m.max_sequence
+        FROM (
+            SELECT session_id, max(sequence_number) AS max_sequence
+            FROM conversation_messages
+            GROUP BY session_id
+        ) AS m
+        WHERE s.id = m.session_id
+    """)
+
+    op.drop_index(op.f('ix_conversation_messages_sequence_number'), table_name='conversation_messages')
+    op.create_unique_constraint(
+        'uq_conversation_messages_session_sequence',
+        'conversation_messages',
+        ['session_id', 'sequence_number'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_conversation_messages_session_sequence', 'conversation_messages', type_='unique')
+    op.create_index(op.f('ix_conversation_messages_sequence_number'), 'conversation_messages', ['session_id', 'sequence_number'], unique=False)
+    op.drop_column('conversation_sessions', 'message_count')
@@ -0,0 +1,30 @@
+"""09_stories_keyset_index
+
+Revision ID: 09
+Revises: 08
+Create Date: 2025-10-05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '09'
+down_revision: Union[str, None] = '08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Backs keyset pagination: WHERE memory_space_id = ? AND (generated_at, id) < (?, ?)
+    op.create_index(
+        'ix_stories_memory_space_generated_id',
+        'stories',
+        ['memory_space_id', sa.text('generated_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stories_memory_space_generated_id', table_name='stories')
@@ -0,0 +1,46 @@
+"""10_story_excerpt
+
+Revision ID: 10
+Revises: 09
+Create Date: 2025-10-05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '10'
+down_revision: Union[str, None] = '09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('stories', sa.Column('excerpt', sa.Text(), server_default='', nullable=False))
+    op.add_column('stories', sa.Column('word_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill with the same rule as libs.utils.story_content_fields (first 50 words)
+    op.execute(r"""
+        UPDATE stories AS s
+        SET word_count = w.word_count,
+            excerpt = CASE
+                WHEN w.word_count <= 50 THEN s.content
+                ELSE array_to_string(w.words[1:50], ' ') || '...'
+            END
+        FROM (
+            SELECT id,
+                   words,
+                   CASE WHEN btrim(content) = '' THEN 0 ELSE cardinality(words) END AS word_count
+            FROM (
+                SELECT id, content, regexp_split_to_array(btrim(content, E' \t\n\r'), E'\\s+') AS words
+                FROM stories
+            ) AS split
+        ) AS w
+        WHERE s.id = w.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('stories', 'word_count')
+    op.drop_column('stories', 'excerpt')
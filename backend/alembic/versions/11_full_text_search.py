@@ -0,0 +1,80 @@
+"""11_full_text_search
+
+Revision ID: 11
+Revises: 10
+Create Date: 2025-10-05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '11'
+down_revision: Union[str, None] = '10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows updated per backfill statement; each batch commits on its own
+BATCH_SIZE = 1000
+
+# Must use the same configuration as database.search.SEARCH_CONFIG.
+# Titles weigh more than story text.
+VECTORS = {
+    'stories': (
+        "setweight(to_tsvector('english', coalesce({row}title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce({row}content, '')), 'B')"
+    ),
+    'conversation_messages': "to_tsvector('english', coalesce({row}content, ''))",
+}
+SOURCE_COLUMNS = {
+    'stories': 'title, content',
+    'conversation_messages': 'content',
+}
+
+
+def upgrade() -> None:
+    for table, vector in VECTORS.items():
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+        # Keep the vector current on every insert and on updates of its source columns
+        op.execute(f"""
+            CREATE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {vector.format(row='NEW.')};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_search_vector_update
+            BEFORE INSERT OR UPDATE OF {SOURCE_COLUMNS[table]} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()
+        """)
+
+    # Outside the migration transaction: short batches so row locks are held
+    # briefly, and indexes built without blocking writes
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for table, vector in VECTORS.items():
+            backfill = sa.text(f"""
+                UPDATE {table} SET search_vector = {vector.format(row='')}
+                WHERE id IN (SELECT id FROM {table} WHERE search_vector IS NULL LIMIT :batch_size)
+            """)
+            while bind.execute(backfill, {'batch_size': BATCH_SIZE}).rowcount == BATCH_SIZE:
+                pass
+            op.create_index(
+                f'ix_{table}_search_vector',
+                table,
+                ['search_vector'],
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    for table in VECTORS:
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.execute(f"DROP TRIGGER {table}_search_vector_update ON {table}")
+        op.execute(f"DROP FUNCTION {table}_search_vector_update()")
+        op.drop_column(table, 'search_vector')
@@ -0,0 +1,50 @@
+"""12_memory_embeddings
+
+Revision ID: 12
+Revises: 11
+Create Date: 2025-10-05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '12'
+down_revision: Union[str, None] = '11'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by the story worker as stories are generated; existing stories
+    # are indexed with `python src/app.py --index-related`
+    op.create_table(
+        'memory_embeddings',
+        sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('gen_random_uuid()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.Column('memory_space_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('session_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('source_type', sa.String(), nullable=False),
+        sa.Column('source_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('chunk', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('embedder', sa.String(), nullable=False),
+        sa.Column('vector', sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(['memory_space_id'], ['memory_spaces.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['session_id'], ['conversation_sessions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # Loading a memory space's index (created_at: its freshness check is index-only),
+    # and replacing one session's passages
+    op.create_index(
+        'ix_memory_embeddings_space_embedder', 'memory_embeddings', ['memory_space_id', 'embedder', 'created_at'], unique=False
+    )
+    op.create_index(op.f('ix_memory_embeddings_session_id'), 'memory_embeddings', ['session_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_memory_embeddings_session_id'), table_name='memory_embeddings')
+    op.drop_index('ix_memory_embeddings_space_embedder', table_name='memory_embeddings')
+    op.drop_table('memory_embeddings')
@@ -0,0 +1,125 @@
+"""Response compression benchmark.
+
+Builds a ``get_by_email``-sized JSON payload of markdown stories and reports,
+for every gzip level (and brotli quality when ``brotli`` is installed), the
+compressed size, bytes saved and CPU time per response. It also streams a
+synthetic SSE response through ``CompressionMiddleware`` to confirm event
+streams are neither compressed nor delayed.
+
+Usage (from backend/):
+    python benchmarks/compression.py --stories 20 --words 800 --repeat 50
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/unused")
+os.environ.setdefault("GOOGLE_API_KEY", "unused")
+os.environ.setdefault("SECRET_KEY", "unused")
+
+from middleware.compression import CompressionMiddleware, brotli  # noqa: E402
+
+WORDS = (
+    "the farm was quiet in the mornings and my father would wake before the sun "
+    "we walked to school along the river every day in winter the snow came up "
+    "to our knees grandmother baked bread on sundays and the whole house smelled "
+    "of it I remember the war years the dances at the town hall your grandfather "
+    "asked me to dance three times before I said yes we married in the spring"
+).split()
+
+
+def build_payload(stories: int, words: int, seed: int = 7) -> bytes:
+    rng = random.Random(seed)
+    items = []
+    for i in range(stories):
+        paragraphs = []
+        for _ in range(max(1, words // 80)):
+            paragraphs.append(" ".join(rng.choice(WORDS) for _ in range(80)).capitalize() + ".")
+        items.append({
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "title": f"Story {i}",
+            "content": "## A Memory\n\n" + "\n\n".join(paragraphs),
+            "grandparent_name": "Rose",
+            "topic": "childhood",
+            "generated_at": "2025-10-05T12:00:00+00:00",
+        })
+    return json.dumps({"stories": items, "total": None, "next_cursor": None}).encode()
+
+
+def measure(name: str, fn, body: bytes, repeat: int) -> None:
+    start = time.process_time()
+    for _ in range(repeat):
+        out = fn(body)
+    cpu = (time.process_time() - start) / repeat
+    saved = len(body) - len(out)
+    print(
+        f"{name:<12} {len(out):>10,} B  saved {saved:>10,} B ({saved / len(body):6.1%})"
+        f"  cpu {cpu * 1000:8.3f} ms/resp  {len(body) / cpu / 1e6:8.1f} MB/s"
+    )
+
+
+async def sse_passthrough(events: int, gap: float) -> None:
+    async def sse_app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/event-stream")],
+        })
+        for i in range(events):
+            await send({"type": "http.response.body", "body": f"data: {i}\n\n".encode() * 200, "more_body": True})
+            await asyncio.sleep(gap)
+        await send({"type": "http.response.body", "body": b""})
+
+    start = time.perf_counter()
+    first_at = None
+    encoded = False
+
+    async def send(message):
+        nonlocal first_at, encoded
+        if message["type"] == "http.response.start":
+            encoded = any(k == b"content-encoding" for k, _ in message["headers"])
+        elif message.get("body") and first_at is None:
+            first_at = time.perf_counter() - start
+
+    async def receive():
+        return {"type": "http.request"}
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip, br")]}
+    await CompressionMiddleware(sse_app, min_size=0)(scope, receive, send)
+    total = time.perf_counter() - start
+    print(
+        f"\nSSE through middleware: first frame after {first_at * 1000:.2f} ms "
+        f"of {total * 1000:.0f} ms total, content-encoding set: {encoded}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stories", type=int, default=20)
+    parser.add_argument("--words", type=int, default=800)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    body = build_payload(args.stories, args.words)
+    print(f"payload: {args.stories} stories x ~{args.words} words = {len(body):,} B JSON\n")
+
+    for level in range(1, 10):
+        measure(f"gzip -{level}", lambda b, lv=level: gzip.compress(b, compresslevel=lv, mtime=0), body, args.repeat)
+    if brotli is not None:
+        for quality in (0, 2, 4, 6, 9, 11):
+            measure(f"brotli q{quality}", lambda b, q=quality: brotli.compress(b, quality=q), body, args.repeat)
+    else:
+        print("brotli      not installed (pip install brotli to include it)")
+
+    asyncio.run(sse_passthrough(events=10, gap=0.02))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""Load test for the chat and story APIs.
+
+Starts the app with uvicorn workers and the fake LLM provider against the
+Postgres in ``DATABASE_URL`` (or targets a running server with ``--url``).
+It then drives concurrent simulated grandparents. Each one:
+
+1. creates a memory space
+2. holds a conversation over SSE, ending it on the last turn
+3. queues its story and polls until generation finishes
+4. lists the memory space's stories
+
+The report covers p50/p95/p99 latencies, time to first token, in-flight
+streams per worker, DB pool saturation and RSS per connection. It is written
+as JSON, so runs from different commits can be compared.
+
+Usage (from backend/, with DATABASE_URL set and migrations applied):
+    python -m benchmarks.loadtest run --users 50 --turns 6 --workers 2
+    python -m benchmarks.loadtest compare results/a.json results/b.json
+"""
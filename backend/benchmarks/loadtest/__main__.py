@@ -0,0 +1,72 @@
+import argparse
+import asyncio
+import sys
+
+from benchmarks.loadtest import __doc__ as usage
+from benchmarks.loadtest.report import build_result, compare, print_result, write_result
+from benchmarks.loadtest.scenario import run_users
+from benchmarks.loadtest.server import Peaks, Server, sample_metrics
+
+
+async def run(args) -> None:
+    server = None if args.url else Server(args)
+    try:
+        if server:
+            await server.start()
+        url = args.url or server.url
+        baseline_rss = server.rss_bytes() if server else None
+
+        peaks = Peaks()
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_metrics(url, server, peaks, args.sample_interval, stop))
+        samples, elapsed = await run_users(url, args)
+        stop.set()
+        await sampler
+    finally:
+        if server:
+            server.stop()
+
+    result = build_result(args, samples, elapsed, peaks, baseline_rss)
+    print_result(result)
+    print(f"\nResults written to {write_result(result, args.output)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=usage, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the load test")
+    run_parser.add_argument("--users", type=int, default=20, help="Simulated grandparents (one conversation each).")
+    run_parser.add_argument("--concurrency", type=int, default=0, help="Users active at once (default: all).")
+    run_parser.add_argument("--turns", type=int, default=6, help="Chat turns per conversation.")
+    run_parser.add_argument("--think-time", type=float, default=0.0, help="Seconds between a user's turns.")
+    run_parser.add_argument("--no-story", action="store_true", help="Skip story generation and listing.")
+    run_parser.add_argument("--url", help="Target an already running server instead of starting one.")
+    run_parser.add_argument("--workers", type=int, default=2, help="Uvicorn workers for the started server.")
+    run_parser.add_argument("--port", type=int, default=8765)
+    run_parser.add_argument("--db-pool-size", type=int, default=5, help="DB_POOL_SIZE of the started server (or of --url's, for saturation).")
+    run_parser.add_argument("--db-max-overflow", type=int, default=10, help="DB_MAX_OVERFLOW of the started server (or of --url's).")
+    run_parser.add_argument("--ttft-ms", type=float, default=400.0, help="Fake model time to first token.")
+    run_parser.add_argument("--token-delay-ms", type=float, default=20.0, help="Fake model delay between tokens.")
+    run_parser.add_argument("--jitter-ms", type=float, default=5.0, help="Fake model jitter on each delay.")
+    run_parser.add_argument("--error-rate", type=float, default=0.0, help="Share of fake model responses that fail.")
+    run_parser.add_argument("--tokens", type=int, default=120, help="Fake model response length.")
+    run_parser.add_argument("--poll-interval", type=float, default=0.25, help="Story status polling interval.")
+    run_parser.add_argument("--story-timeout", type=float, default=120.0)
+    run_parser.add_argument("--request-timeout", type=float, default=120.0)
+    run_parser.add_argument("--sample-interval", type=float, default=0.25, help="Seconds between /metrics scrapes.")
+    run_parser.add_argument("--output", help="Result file (default: benchmarks/results/loadtest-<time>-<commit>.json).")
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Flag latency/throughput changes worse than this.")
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        sys.exit(0 if compare(args.before, args.after, args.threshold) else 1)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
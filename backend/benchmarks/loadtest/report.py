@@ -0,0 +1,154 @@
+import json
+import os
+import subprocess
+from datetime import datetime, timezone
+
+from benchmarks.loadtest.scenario import Samples
+from benchmarks.loadtest.server import Peaks
+
+# Metrics where a higher value is better; everything else is a latency or a cost
+HIGHER_IS_BETTER = ("throughput",)
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def distribution(values: list[float]) -> dict:
+    """Count, mean and p50/p95/p99 in milliseconds."""
+    ms = lambda v: None if v is None else round(v * 1000, 2)  # noqa: E731
+    return {
+        "count": len(values),
+        "mean_ms": ms(sum(values) / len(values)) if values else None,
+        "p50_ms": ms(percentile(values, 50)),
+        "p95_ms": ms(percentile(values, 95)),
+        "p99_ms": ms(percentile(values, 99)),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_result(args, samples: Samples, elapsed: float, peaks: Peaks, baseline_rss: int | None) -> dict:
+    workers = args.workers if not args.url else None
+    pool_capacity = (args.db_pool_size + args.db_max_overflow) * workers if workers else None
+    checked_out = peaks.db_checked_out.get("app")
+    rss_growth = peaks.rss_bytes - baseline_rss if peaks.rss_bytes and baseline_rss else None
+    concurrency = min(args.concurrency or args.users, args.users)
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            key: getattr(args, key)
+            for key in (
+                "url", "users", "concurrency", "turns", "think_time", "workers",
+                "ttft_ms", "token_delay_ms", "jitter_ms", "error_rate", "tokens", "no_story",
+            )
+        },
+        "duration_s": round(elapsed, 2),
+        "throughput": {
+            "turns_per_s": round(samples.turns / elapsed, 2),
+            "conversations_per_s": round(samples.conversations / elapsed, 3),
+        },
+        "latency": {
+            "chat_turn": distribution(samples.turn_latency),
+            "chat_ttft": distribution(samples.ttft),
+            "create_space": distribution(samples.create_space),
+            "story_queue": distribution(samples.story_queue),
+            "story_ready": distribution(samples.story_ready),
+            "story_list": distribution(samples.story_list),
+        },
+        "streams": {
+            "peak_in_flight": peaks.sse_streams,
+            "peak_per_worker": round(peaks.sse_streams / workers, 2) if workers else None,
+        },
+        "db_pool": {
+            "peak_checked_out": peaks.db_checked_out,
+            "peak_overflow": peaks.db_overflow,
+            "app_capacity": pool_capacity,
+            "app_saturation": round(checked_out / pool_capacity, 3) if pool_capacity and checked_out is not None else None,
+        },
+        "memory": {
+            "baseline_rss_mb": round(baseline_rss / 2**20, 1) if baseline_rss else None,
+            "peak_rss_mb": round(peaks.rss_bytes / 2**20, 1) if peaks.rss_bytes else None,
+            "rss_per_connection_kb": round(rss_growth / concurrency / 1024, 1) if rss_growth is not None else None,
+        },
+        "errors": samples.errors,
+        "metrics_samples": peaks.samples,
+    }
+
+
+def write_result(result: dict, path: str | None) -> str:
+    if path is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = os.path.join(os.path.dirname(__file__), "..", "results", f"loadtest-{stamp}-{result['commit'] or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    return os.path.normpath(path)
+
+
+def print_result(result: dict) -> None:
+    print(f"\n{result['config']['users']} users, {result['config']['turns']} turns, {result['duration_s']}s "
+          f"({result['throughput']['turns_per_s']} turns/s)")
+    print(f"  {'':<14}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, dist in result["latency"].items():
+        if dist["count"]:
+            print(f"  {name:<14}{dist['count']:>7}{dist['p50_ms']:>10}{dist['p95_ms']:>10}{dist['p99_ms']:>10}")
+    print(f"  streams in flight: peak {result['streams']['peak_in_flight']:.0f} "
+          f"({result['streams']['peak_per_worker']} per worker)")
+    pool = result["db_pool"]
+    print(f"  db pool: peak checked out {pool['peak_checked_out']}, overflow {pool['peak_overflow']}, "
+          f"saturation {pool['app_saturation']}")
+    memory = result["memory"]
+    print(f"  rss: {memory['baseline_rss_mb']} -> {memory['peak_rss_mb']} MB "
+          f"({memory['rss_per_connection_kb']} KB per connection)")
+    if result["errors"]:
+        print(f"  errors: {result['errors']}")
+
+
+def flatten(data: dict, prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(before_path: str, after_path: str, threshold: float) -> bool:
+    """Print the change of every numeric result; return False if any got worse by more than ``threshold``."""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"{before.get('commit')} -> {after.get('commit')}")
+
+    sections = ("throughput", "latency", "streams", "db_pool", "memory")
+    old = flatten({key: before.get(key, {}) for key in sections})
+    new = flatten({key: after.get(key, {}) for key in sections})
+    ok = True
+    for name in sorted(old.keys() & new.keys()):
+        if old[name] == 0 or name.endswith(".count"):
+            continue
+        change = new[name] / old[name] - 1
+        worse = -change if name.startswith(HIGHER_IS_BETTER) else change
+        flag = ""
+        if name.startswith(("throughput", "latency")) and worse > threshold:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"  {name:<40}{old[name]:>12}{new[name]:>12}{change:>+9.1%}{flag}")
+    return ok
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+
+import httpx
+
+ANSWERS = [
+    "We lived in a small house by the river, and every summer my brothers and I built rafts.",
+    "I met your grandmother at a dance in the village hall. She wore a blue dress.",
+    "I worked at the railway for thirty years, mostly on the night shift.",
+    "Always keep your word. People forget many things, but not whether you kept it.",
+    "The biggest surprise was the day we won the county fair with our apple pie.",
+]
+
+
+@dataclass
+class Samples:
+    """Raw measurements (seconds) collected by every simulated user."""
+
+    turn_latency: list[float] = field(default_factory=list)
+    ttft: list[float] = field(default_factory=list)
+    create_space: list[float] = field(default_factory=list)
+    story_queue: list[float] = field(default_factory=list)
+    story_ready: list[float] = field(default_factory=list)
+    story_list: list[float] = field(default_factory=list)
+    errors: dict[str, int] = field(default_factory=dict)
+    turns: int = 0
+    conversations: int = 0
+
+    def error(self, kind: str) -> None:
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+async def chat_turn(client: httpx.AsyncClient, body: dict, samples: Samples) -> dict | None:
+    """Send one chat turn and read the SSE stream; return the ``done`` event."""
+    start = time.perf_counter()
+    first_token = None
+    done = None
+    async with client.stream("POST", "/api/conversations/chat", json=body) as response:
+        if response.status_code != 200:
+            samples.error(f"chat_http_{response.status_code}")
+            return None
+        async for line in response.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            event = json.loads(line[6:])
+            if event["type"] == "token" and first_token is None:
+                first_token = time.perf_counter() - start
+            elif event["type"] == "done":
+                done = event
+            elif event["type"] == "error":
+                samples.error("chat_stream_error")
+    if done is None:
+        return None
+    samples.turn_latency.append(time.perf_counter() - start)
+    if first_token is not None:
+        samples.ttft.append(first_token)
+    samples.turns += 1
+    return done
+
+
+async def wait_for_story(client: httpx.AsyncClient, story_id: str, poll_interval: float, timeout: float) -> str:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        response = await client.get("/api/stories/status", params={"story_id": story_id})
+        status = response.json().get("status") if response.status_code == 200 else "http_error"
+        if status not in ("pending", "generating"):
+            return status
+        await asyncio.sleep(poll_interval)
+    return "timeout"
+
+
+async def simulate_user(client: httpx.AsyncClient, user: int, args, samples: Samples) -> None:
+    """One grandparent: memory space, conversation, story, story list."""
+    start = time.perf_counter()
+    response = await client.post(
+        "/api/memory_spaces/create",
+        json={
+            "grandparent_name": f"Load Test {user}",
+            "relation": "grandparent",
+            "creator_email": f"loadtest-{uuid.uuid4().hex[:12]}@example.com",
+        },
+    )
+    if response.status_code != 200:
+        samples.error(f"create_space_http_{response.status_code}")
+        return
+    samples.create_space.append(time.perf_counter() - start)
+    memory_space_id = response.json()["memory_space_id"]
+
+    session_id = None
+    for turn in range(args.turns):
+        body = {"memory_space_id": memory_space_id, "user_message": ANSWERS[turn % len(ANSWERS)] if turn else None}
+        if session_id:
+            body["session_id"] = session_id
+        if turn == args.turns - 1:
+            body["end_conversation"] = True
+        done = await chat_turn(client, body, samples)
+        if done is None:
+            return
+        session_id = done["session_id"]
+        if args.think_time:
+            await asyncio.sleep(args.think_time)
+    samples.conversations += 1
+
+    if args.no_story:
+        return
+    start = time.perf_counter()
+    response = await client.post("/api/stories/generate", json={"session_id": session_id})
+    if response.status_code != 200:
+        samples.error(f"story_generate_http_{response.status_code}")
+        return
+    samples.story_queue.append(time.perf_counter() - start)
+    status = await wait_for_story(client, response.json()["story_id"], args.poll_interval, args.story_timeout)
+    if status != "generated":
+        samples.error(f"story_{status}")
+        return
+    samples.story_ready.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    response = await client.get("/api/stories/get_by_memory_space", params={"space_id": memory_space_id})
+    if response.status_code != 200:
+        samples.error(f"story_list_http_{response.status_code}")
+        return
+    samples.story_list.append(time.perf_counter() - start)
+
+
+async def run_users(base_url: str, args) -> tuple[Samples, float]:
+    """Run ``args.users`` simulated users, at most ``args.concurrency`` at a time."""
+    samples = Samples()
+    semaphore = asyncio.Semaphore(args.concurrency or args.users)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.request_timeout, limits=limits) as client:
+
+        async def one(user: int) -> None:
+            async with semaphore:
+                try:
+                    await simulate_user(client, user, args, samples)
+                except httpx.HTTPError as e:
+                    samples.error(type(e).__name__)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(user) for user in range(args.users)))
+        return samples, time.perf_counter() - start
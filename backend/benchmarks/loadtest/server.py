@@ -0,0 +1,144 @@
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - optional, only needed for RSS figures
+    psutil = None
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+class Server:
+    """The app under uvicorn workers with the fake LLM provider.
+
+    Every setting can still be overridden from the environment; the fake
+    model's timings come from the command line.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.port = args.port
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.metrics_dir = tempfile.mkdtemp(prefix="loadtest-metrics-")
+        self.process: subprocess.Popen | None = None
+
+    def environment(self) -> dict:
+        env = dict(os.environ)
+        env.update(
+            LLM_PROVIDER="fake",
+            FAKE_LLM_TTFT_MS=str(self.args.ttft_ms),
+            FAKE_LLM_TOKEN_DELAY_MS=str(self.args.token_delay_ms),
+            FAKE_LLM_JITTER_MS=str(self.args.jitter_ms),
+            FAKE_LLM_ERROR_RATE=str(self.args.error_rate),
+            FAKE_LLM_TOKENS=str(self.args.tokens),
+            # The pool the saturation figures in the report are computed against
+            DB_POOL_SIZE=str(self.args.db_pool_size),
+            DB_MAX_OVERFLOW=str(self.args.db_max_overflow),
+            PROMETHEUS_MULTIPROC_DIR=self.metrics_dir,
+        )
+        env.setdefault("SECRET_KEY", "loadtest")
+        return env
+
+    async def start(self) -> None:
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "app:app",
+                "--app-dir", "src",
+                "--host", "127.0.0.1",
+                "--port", str(self.port),
+                "--workers", str(self.args.workers),
+                "--log-level", "warning",
+            ],
+            cwd=BACKEND_DIR,
+            env=self.environment(),
+        )
+        # Ready once every worker has warmed up; /health answers 503 until then
+        deadline = time.perf_counter() + 60
+        async with httpx.AsyncClient(base_url=self.url, timeout=2) as client:
+            while time.perf_counter() < deadline:
+                if self.process.poll() is not None:
+                    raise RuntimeError(f"Server exited with code {self.process.returncode}")
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        return
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(0.2)
+        raise RuntimeError("Server did not become ready within 60s")
+
+    def rss_bytes(self) -> int | None:
+        """RSS of the server and all of its workers."""
+        if psutil is None or self.process is None:
+            return None
+        try:
+            parent = psutil.Process(self.process.pid)
+            return sum(p.memory_info().rss for p in [parent, *parent.children(recursive=True)])
+        except psutil.Error:
+            return None
+
+    def stop(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        shutil.rmtree(self.metrics_dir, ignore_errors=True)
+
+
+@dataclass
+class Peaks:
+    """Highest values seen by the sampler while the load ran."""
+
+    sse_streams: float = 0.0
+    db_checked_out: dict[str, float] = field(default_factory=dict)
+    db_overflow: dict[str, float] = field(default_factory=dict)
+    rss_bytes: int | None = None
+    samples: int = 0
+
+
+def read_gauges(text: str) -> dict[tuple[str, str], float]:
+    """Sum the gauges the load test tracks, keyed by (metric, pool/stream label)."""
+    values: dict[tuple[str, str], float] = {}
+    for family in text_string_to_metric_families(text):
+        if family.name not in ("sse_streams_in_flight", "db_pool_checked_out_connections", "db_pool_overflow_connections"):
+            continue
+        for sample in family.samples:
+            key = (family.name, sample.labels.get("pool", ""))
+            values[key] = values.get(key, 0.0) + sample.value
+    return values
+
+
+async def sample_metrics(url: str, server: Server | None, peaks: Peaks, interval: float, stop: asyncio.Event) -> None:
+    """Scrape /metrics (and the server's RSS) until ``stop`` is set, keeping peaks."""
+    async with httpx.AsyncClient(base_url=url, timeout=5) as client:
+        while not stop.is_set():
+            try:
+                gauges = read_gauges((await client.get("/metrics")).text)
+            except httpx.HTTPError:
+                gauges = {}
+            for (name, pool), value in gauges.items():
+                if name == "sse_streams_in_flight":
+                    peaks.sse_streams = max(peaks.sse_streams, value)
+                elif name == "db_pool_checked_out_connections":
+                    peaks.db_checked_out[pool] = max(peaks.db_checked_out.get(pool, 0.0), value)
+                else:
+                    peaks.db_overflow[pool] = max(peaks.db_overflow.get(pool, 0.0), value)
+            rss = server.rss_bytes() if server else None
+            if rss is not None:
+                peaks.rss_bytes = max(peaks.rss_bytes or 0, rss)
+            peaks.samples += 1
+            try:
+                await asyncio.wait_for(stop.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,106 @@
+"""Error-handler middleware overhead micro-benchmark.
+
+Serves a small JSON route and a short SSE route in-process (httpx
+ASGITransport, no sockets) and reports requests per second with:
+
+- no middleware
+- the previous ``BaseHTTPMiddleware`` error handler
+- the pure ASGI ``ErrorHandlerMiddleware``
+
+Usage (from backend/):
+    python benchmarks/middleware_overhead.py --requests 3000 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from middleware.error_handler import ErrorHandlerMiddleware  # noqa: E402
+
+
+class BaseHTTPErrorHandler(BaseHTTPMiddleware):
+    """The error handler as it was before the ASGI rewrite."""
+
+    async def dispatch(self, request: Request, call_next):
+        try:
+            return await call_next(request)
+        except Exception as e:
+            return JSONResponse(status_code=500, content={"error": str(e), "type": type(e).__name__})
+
+
+def build_app(middleware) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/json")
+    async def json_route():
+        return {"status": "ok", "items": list(range(20))}
+
+    @app.get("/sse")
+    async def sse_route():
+        async def events():
+            for i in range(10):
+                yield f"data: {i}\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+async def run(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one() -> None:
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        await asyncio.gather(*[one() for _ in range(50)])  # warm up
+        start = time.perf_counter()
+        await asyncio.gather(*[one() for _ in range(requests)])
+        return requests / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    variants = {
+        "none": None,
+        "BaseHTTPMiddleware": BaseHTTPErrorHandler,
+        "pure ASGI": ErrorHandlerMiddleware,
+    }
+    for path in ("/json", "/sse"):
+        baseline = None
+        print(f"\n{path}  ({args.requests} requests, concurrency {args.concurrency})")
+        for name, middleware in variants.items():
+            rps = await run(build_app(middleware), path, args.requests, args.concurrency)
+            baseline = baseline or rps
+            print(f"  {name:<20} {rps:>8.0f} req/s  ({rps / baseline - 1:+.1%} vs none)")
+
+    # Both handlers must produce the same error body
+    for name, middleware in list(variants.items())[1:]:
+        transport = httpx.ASGITransport(app=build_app(middleware), raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.get("/boom")
+            print(f"\n{name} error response: {response.status_code} {response.json()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
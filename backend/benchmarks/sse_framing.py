@@ -0,0 +1,80 @@
+"""SSE token framing micro-benchmark.
+
+Compares the original per-chunk ``json.dumps`` framing with the coalesced
+writer in ``libs.sse`` across many concurrent synthetic streams. Every frame
+is written to /dev/null so the per-frame syscall cost of a real socket is
+part of the measurement.
+
+Usage (from backend/):
+    python benchmarks/sse_framing.py --streams 200 --tokens 300 --gap-ms 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from libs.sse import coalesce, token_event  # noqa: E402
+
+
+async def synthetic_tokens(count: int, gap: float):
+    for i in range(count):
+        await asyncio.sleep(gap)
+        yield f"tok{i} "
+
+
+SINK = os.open(os.devnull, os.O_WRONLY)
+
+
+async def per_chunk(count: int, gap: float) -> int:
+    frames = 0
+    async for content in synthetic_tokens(count, gap):
+        frame = f"data: {json.dumps({'type': 'token', 'content': content})}\n\n"
+        os.write(SINK, frame.encode())
+        frames += 1
+    return frames
+
+
+async def coalesced(count: int, gap: float, interval: float, max_chars: int) -> int:
+    frames = 0
+    async for text in coalesce(synthetic_tokens(count, gap), interval, max_chars):
+        os.write(SINK, token_event(text).encode())
+        frames += 1
+    return frames
+
+
+async def run(name: str, make, streams: int) -> None:
+    cpu, wall = time.process_time(), time.perf_counter()
+    frames = sum(await asyncio.gather(*[make() for _ in range(streams)]))
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    print(
+        f"{name:<10} frames={frames:<8} frames/s={frames / wall:>10.0f} "
+        f"frames/stream={frames / streams:>7.1f} cpu/stream={cpu / streams * 1000:>7.2f}ms wall={wall:.2f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--streams", type=int, default=200)
+    parser.add_argument("--tokens", type=int, default=300)
+    parser.add_argument("--gap-ms", type=float, default=2.0)
+    parser.add_argument("--coalesce-ms", type=float, default=30.0)
+    parser.add_argument("--max-chars", type=int, default=512)
+    args = parser.parse_args()
+
+    gap = args.gap_ms / 1000
+    asyncio.run(run("per-chunk", lambda: per_chunk(args.tokens, gap), args.streams))
+    asyncio.run(
+        run(
+            "coalesced",
+            lambda: coalesced(args.tokens, gap, args.coalesce_ms / 1000, args.max_chars),
+            args.streams,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Story generation latency against transcript length.
+
+Times the single-call path (the whole transcript in one prompt) against the
+map-reduce path of ``StoryAgentFactory.prepare_input`` (notes on transcript
+windows taken concurrently, then the story written from the notes) for
+synthetic conversations of increasing length.
+
+By default the fake provider is used, with a prefill cost per 1000 prompt
+characters so latency grows with prompt size the way a real provider's
+does. ``--real`` uses the configured provider instead (one story per path
+and length, billed as usual).
+
+Usage (from backend/, with the app's .env present):
+    python benchmarks/story_pipeline.py --turns 100 200 300 400 --prefill-ms 40
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from config.settings import settings  # noqa: E402
+from libs.story_agent.agent import StoryAgentFactory  # noqa: E402
+from libs.utils import format_transcript, split_transcript  # noqa: E402
+
+Message = namedtuple("Message", "role content")
+
+QUESTIONS = [
+    "What was the house you grew up in like?",
+    "Who was your best friend when you were young, and what did you do together?",
+    "How did you feel when you left home for the first time?",
+    "What is something you wish you had known at my age?",
+]
+WORDS = (
+    "we lived near the river and my father worked long days at the mill while my mother kept "
+    "the garden and in the summer we swam and fished and in the winter the snow came up to the windows"
+).split()
+
+
+def conversation(turns: int, answer_words: int) -> list[Message]:
+    rng = random.Random(turns)
+    messages = []
+    for turn in range(turns):
+        messages.append(Message("assistant", QUESTIONS[turn % len(QUESTIONS)]))
+        messages.append(Message("user", " ".join(rng.choice(WORDS) for _ in range(answer_words))))
+    return messages
+
+
+async def timed(factory: StoryAgentFactory, messages: list[Message], min_chars: int) -> float:
+    settings.story_map_reduce_min_chars = min_chars
+    start = time.perf_counter()
+    await factory.generate_story(messages)
+    return time.perf_counter() - start
+
+
+async def run(args) -> None:
+    factory = StoryAgentFactory()
+    if not args.real:
+        from libs.llm.fake import FakeModel
+
+        factory.model = FakeModel(
+            ttft=args.ttft_ms / 1000,
+            token_delay=args.token_delay_ms / 1000,
+            jitter=0.0,
+            tokens=args.tokens,
+            prefill=args.prefill_ms / 1000,
+        )
+    settings.story_chunk_chars = args.chunk_chars
+    settings.story_map_concurrency = args.concurrency
+
+    print(f"{'turns':>6} {'chars':>9} {'parts':>6} {'single s':>9} {'map-reduce s':>13} {'ratio':>6}")
+    for turns in args.turns:
+        messages = conversation(turns, args.answer_words)
+        chars = len(format_transcript(messages))
+        parts = len(split_transcript(messages, args.chunk_chars))
+        single = await timed(factory, messages, min_chars=sys.maxsize)
+        chunked = await timed(factory, messages, min_chars=0)
+        print(f"{turns:>6} {chars:>9} {parts:>6} {single:>9.2f} {chunked:>13.2f} {chunked / single:>6.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, nargs="+", default=[20, 50, 100, 200, 400])
+    parser.add_argument("--answer-words", type=int, default=80, help="Words per grandparent answer.")
+    parser.add_argument("--chunk-chars", type=int, default=settings.story_chunk_chars)
+    parser.add_argument("--concurrency", type=int, default=settings.story_map_concurrency)
+    parser.add_argument("--real", action="store_true", help="Use the configured provider instead of the fake one.")
+    parser.add_argument("--ttft-ms", type=float, default=500.0, help="Fake model time to first token.")
+    parser.add_argument("--prefill-ms", type=float, default=40.0, help="Fake model extra TTFT per 1000 prompt chars.")
+    parser.add_argument("--token-delay-ms", type=float, default=5.0, help="Fake model delay between tokens.")
+    parser.add_argument("--tokens", type=int, default=300, help="Fake model response length.")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Per-turn chat persistence: database time and statements per turn.
+
+Replays the statements ``post_chat`` used to run around the LLM call (load
+the session and its memory space, bump the counters, count the messages,
+insert the user message, insert the reply: six statements and three
+commits on one session) against ``start_turn`` and ``finish_turn`` from
+``services/conversations/turns.py``, for sequential turns of one
+conversation. No LLM is involved; only database time is measured.
+
+``--rtt-ms`` adds a delay before every statement to stand in for the
+network round trip to a remote database, which the socket used locally
+hides.
+
+Usage (from backend/, with the app's .env present and migrations applied):
+    python benchmarks/turn_persistence.py --turns 300 --rtt-ms 0 1
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from sqlalchemy import delete, event, func, select  # noqa: E402
+
+from database.postgres import async_engine, async_session  # noqa: E402
+from models import (  # noqa: E402
+    ConversationMessage,
+    ConversationSession,
+    MemorySpace,
+    MessageRole,
+    SessionStatus,
+    TopicEnum,
+)
+from services.conversations.turns import finish_turn, start_turn  # noqa: E402
+
+REPLY = "That sounds wonderful. What else do you remember about the farm?"
+
+statements = 0
+rtt = 0.0
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _count(*args) -> None:
+    global statements
+    statements += 1
+    if rtt:
+        time.sleep(rtt)
+
+
+async def original_turn(session_id: uuid.UUID, message: str) -> None:
+    """The persistence steps of ``post_chat`` before turn.py, on one request session."""
+    async with async_session() as session:
+        conversation_session = (await session.execute(
+            select(ConversationSession).where(ConversationSession.id == session_id)
+        )).scalar_one_or_none()
+        (await session.execute(
+            select(MemorySpace).where(MemorySpace.id == conversation_session.memory_space_id)
+        )).scalar_one_or_none()
+        conversation_session.question_count += 1
+        await session.commit()
+
+        count = (await session.execute(
+            select(func.count(ConversationMessage.id)).where(ConversationMessage.session_id == session_id)
+        )).scalar() or 0
+        session.add(ConversationMessage(
+            session_id=session_id, role=MessageRole.USER.value, content=message, sequence_number=count + 1,
+        ))
+        await session.commit()
+
+        session.add(ConversationMessage(
+            session_id=session_id, role=MessageRole.ASSISTANT.value, content=REPLY, sequence_number=count + 2,
+        ))
+        await session.commit()
+
+
+async def current_turn(memory_space_id: uuid.UUID, session_id: uuid.UUID, message: str) -> None:
+    turn = await start_turn(memory_space_id, session_id, message, end_conversation=False)
+    await finish_turn(turn.id, turn.message_count, REPLY)
+
+
+async def new_session(memory_space_id: uuid.UUID) -> uuid.UUID:
+    async with async_session() as session:
+        conversation_session = ConversationSession(
+            memory_space_id=memory_space_id, topic=TopicEnum.CHILDHOOD, status=SessionStatus.IN_PROGRESS,
+            input_mode="text", started_at=datetime.now(timezone.utc),
+        )
+        session.add(conversation_session)
+        await session.commit()
+        return conversation_session.id
+
+
+async def measure(name: str, turn, turns: int) -> None:
+    global statements
+    # Warm up the pool and statement caches first
+    for i in range(5):
+        await turn(f"warmup {i}")
+    statements = 0
+    times = []
+    for i in range(turns):
+        start = time.perf_counter()
+        await turn(f"We lived by the river, answer {i}.")
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    print(
+        f"{name:<9} {rtt * 1000:>6.1f} {statements / turns:>11.1f} {statistics.median(times):>8.2f} "
+        f"{times[int(len(times) * 0.95)]:>8.2f}"
+    )
+
+
+async def run(args) -> None:
+    global rtt
+    memory_space = await MemorySpace(
+        grandparent_name="Benchmark", relation="grandparent", access_token=f"benchmark-{uuid.uuid4()}"
+    ).create()
+    session_ids = []
+    try:
+        print(f"{'path':<9} {'rtt ms':>6} {'stmts/turn':>11} {'p50 ms':>8} {'p95 ms':>8}")
+        for rtt_ms in args.rtt_ms:
+            rtt = rtt_ms / 1000
+            session_ids.append(original_id := await new_session(memory_space.id))
+            await measure("original", lambda message: original_turn(original_id, message), args.turns)
+            session_ids.append(current_id := await new_session(memory_space.id))
+            await measure("current", lambda message: current_turn(memory_space.id, current_id, message), args.turns)
+    finally:
+        rtt = 0.0
+        async with async_session() as session:
+            await session.execute(delete(ConversationMessage).where(ConversationMessage.session_id.in_(session_ids)))
+            await session.execute(delete(ConversationSession).where(ConversationSession.id.in_(session_ids)))
+            await session.execute(delete(MemorySpace).where(MemorySpace.id == memory_space.id))
+            await session.commit()
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=300, help="Sequential turns per path.")
+    parser.add_argument("--rtt-ms", type=float, nargs="+", default=[0.0], help="Simulated round trip per statement.")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,37 @@
-from fastapi import FastAPI
+import logging
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from config.settings import settings
+from database import postgres
+from database.cache import cache_stats
+from libs import metrics, tracing
 import argparse
 from services.__base.manager import Manager
 
-app = FastAPI(title="Memory Keeper API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+  # Warm the DB pool, then start service hooks (Agno pool, LLM clients, story worker).
+  # Uvicorn only accepts traffic once this returns; /health reports the phase.
+  app.state.phase = "starting"
+  begin = time.perf_counter()
+  try:
+    await postgres.warmup(settings.warmup_db_connections)
+  except Exception as e:
+    logging.getLogger(__name__).warning(f"Database warmup failed: {e}")
+  manager.startup_report["warmup_db_ms"] = round((time.perf_counter() - begin) * 1000, 1)
+  await manager.startup()
+  app.state.phase = "ready"
+  yield
+  # In-flight requests have finished by now; stop background work and close pools
+  app.state.phase = "draining"
+  await manager.shutdown()
+  await postgres.dispose()
+
+
+app = FastAPI(title="Memory Keeper API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,9 +51,23 @@ async def root():
     }
 
 @app.get("/health")
-async def health_check():
-    return {"status": "ok"}
+async def health_check(response: Response):
+    phase = getattr(app.state, "phase", "starting")
+    if phase != "ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ok" if phase == "ready" else phase,
+        "caches": cache_stats(),
+        "services": manager.stats(),
+        "startup": manager.startup_report,
+    }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    body, content_type = metrics.render()
+    return Response(body, media_type=content_type)
+
+tracing.configure_logging()
 manager = Manager(app, prefix="/api")
 manager.register_services()
 manager.register_middlewares()
@@ -38,19 +79,43 @@ def main():
   parser.add_argument("--port", type=int, default=8000, help="Port to run the server on.")
   parser.add_argument("--workers", type=int, default=4, help="Number of workers to run the server on.")
   parser.add_argument("--timeout", type=int, default=600, help="Worker timeout in seconds.")
+  parser.add_argument("--write-route-manifest", action="store_true", help="Write services/routes.json and exit.")
+  parser.add_argument("--index-related", action="store_true", help="Index all ready stories for related memories and exit.")
   args = parser.parse_args()
 
+  if args.write_route_manifest:
+    print(f"Route manifest written to {manager.write_manifest()}")
+    return
+
+  if args.index_related:
+    import asyncio
+    from services.stories.related import index_all
+
+    print(f"Indexed {asyncio.run(index_all())} stories for related memories")
+    return
+
   if args.dev:
     import uvicorn
 
     uvicorn.run("app:app", host=args.host, port=args.port, reload=True)
   else:
+    import os
+    import shutil
     import subprocess
+    import tempfile
+
+    # Workers write their metrics here so /metrics can aggregate them; start empty
+    # so samples from a previous run (or dead PIDs) never leak into this one
+    metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="evermore-metrics-"))
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
 
     try:
       subprocess.run([
         "gunicorn",
         "src.app:app",
+        "--config",
+        "src/gunicorn_conf.py",
         "--log-level",
         "info",
         "--workers",
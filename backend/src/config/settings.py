@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -6,11 +8,95 @@ load_dotenv()
 
 class Settings(BaseSettings):
     database_url: str
-    google_api_key: str
+    google_api_key: str = ""
     secret_key: str
     cors_origins: list[str] = ["*"]
     app_base_url: str = "https://localhost:8000"
 
+    # Async SQLAlchemy pool (per worker)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+
+    # LLM provider for both agents; "fake" streams synthetic tokens locally (no network or API key)
+    llm_provider: Literal["gemini", "fake"] = "gemini"
+    llm_model_id: str = "gemini-2.5-flash"
+
+    # Fake provider: time to first token, delay between tokens, +/- jitter on each,
+    # share of responses that fail (at a random point), response length in tokens
+    # and extra time to first token per 1000 prompt characters
+    fake_llm_ttft_ms: float = 400.0
+    fake_llm_token_delay_ms: float = 20.0
+    fake_llm_jitter_ms: float = 5.0
+    fake_llm_error_rate: float = 0.0
+    fake_llm_tokens: int = 200
+    fake_llm_prefill_ms_per_1k_chars: float = 0.0
+
+    # Startup warmup: connections opened per pool and whether to prime the model clients
+    warmup_db_connections: int = 2
+    warmup_llm: bool = True
+    warmup_llm_timeout: float = 10.0
+
+    # Conversation agent pool
+    agent_pool_size: int = 256
+    agent_pool_ttl_seconds: float = 1800.0
+
+    # Read-through caches for rarely changing rows (per worker)
+    memory_space_cache_size: int = 1024
+    memory_space_cache_ttl_seconds: float = 300.0
+    conversation_session_cache_size: int = 1024
+    conversation_session_cache_ttl_seconds: float = 60.0
+
+    # HTTP caching of story and memory space reads (seconds)
+    http_cache_max_age: int = 60
+    http_cache_stale_while_revalidate: int = 300
+
+    # Response compression for JSON/text bodies of at least N bytes (brotli if installed)
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 5
+    compression_brotli_quality: int = 4
+
+    # Request tracing: fraction of requests whose stage spans are logged and sent as Server-Timing (0 disables)
+    trace_sample_rate: float = 0.0
+
+    # Conversation context: last N turns verbatim, older turns folded into a summary
+    # (at most T tokens) once K turns have left the window since the last fold
+    chat_history_turns: int = 6
+    chat_summary_token_budget: int = 500
+    chat_summary_batch_turns: int = 4
+
+    # SSE token framing: batch chunks for up to N ms or M chars (0 ms disables)
+    sse_coalesce_ms: int = 30
+    sse_coalesce_max_chars: int = 512
+
+    # Background story generation
+    story_worker_concurrency: int = 2
+    story_worker_poll_interval: float = 2.0
+    story_job_lease_seconds: float = 300.0
+    story_job_max_attempts: int = 3
+
+    # Long transcripts (over N chars) are split into windows of about M chars whose notes,
+    # taken at most K at once, replace the transcript in the story prompt. Map-reduce is
+    # faster from about 90k chars once every window runs in one wave (benchmarks/story_pipeline.py)
+    story_map_reduce_min_chars: int = 90000
+    story_chunk_chars: int = 16000
+    story_map_concurrency: int = 16
+
+    # Chapters written at once when a conversation is turned into one story per topic
+    story_chapter_concurrency: int = 5
+
+    # Related memories: embedder, its vector size, lowest cosine similarity shown
+    # and the per-worker cache of memory space indexes
+    related_embedder: str = "hashed_tfidf"
+    related_embedding_dim: int = 512
+    related_min_score: float = 0.05
+    related_index_cache_size: int = 128
+    related_index_cache_ttl_seconds: float = 300.0
+
+    # Memory space export: rows per server-side cursor fetch, bytes buffered before a chunk is sent
+    export_yield_per: int = 200
+    export_chunk_bytes: int = 64 * 1024
+
     class Config:
         env_file = ".env"
 
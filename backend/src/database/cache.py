@@ -0,0 +1,144 @@
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class ReadThroughCache:
+  """Bounded LRU/TTL cache for rows that rarely change.
+
+  Values are loaded with the caller's coroutine on a miss. Concurrent misses
+  for the same key share one in-flight load instead of each running its own
+  query. ``None`` results are not cached so a row created right after a miss
+  is visible immediately.
+  """
+
+  def __init__(self, name: str, max_size: int = 1024, ttl_seconds: float = 300.0):
+    self.name = name
+    self.max_size = max_size
+    self.ttl_seconds = ttl_seconds
+    self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+    self._loading: Dict[Hashable, asyncio.Future] = {}
+    self.hits = 0
+    self.misses = 0
+    self.coalesced = 0
+    self.evictions = 0
+
+  async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached value for ``key``, loading it on a miss."""
+    now = time.monotonic()
+    entry = self._entries.get(key)
+    if entry is not None:
+      if now - entry[1] < self.ttl_seconds:
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+      self._discard(key)
+
+    pending = self._loading.get(key)
+    if pending is not None:
+      self.coalesced += 1
+      try:
+        return await asyncio.shield(pending)
+      except asyncio.CancelledError:
+        if not pending.cancelled():
+          raise
+        # The loading request was cancelled, not this one: load it ourselves
+        return await self.get(key, loader)
+
+    self.misses += 1
+    future = asyncio.get_running_loop().create_future()
+    self._loading[key] = future
+    try:
+      value = await loader()
+    except asyncio.CancelledError:
+      future.cancel()
+      raise
+    except Exception as e:
+      future.set_exception(e)
+      # Nobody may be waiting on the shared future; mark the error as retrieved
+      future.exception()
+      raise
+    else:
+      future.set_result(value)
+      # An invalidation during the load drops the in-flight entry; don't cache then
+      if value is not None and self._loading.get(key) is future:
+        self._set(key, value)
+      return value
+    finally:
+      if self._loading.get(key) is future:
+        del self._loading[key]
+
+  def peek(self, key: Hashable, accept: Callable[[Any], bool] = lambda value: True) -> Any:
+    """Return the fresh cached value for ``key`` if ``accept`` approves it, else ``None``.
+
+    Never loads; a rejected or missing entry doesn't count as a lookup.
+    """
+    entry = self._entries.get(key)
+    if entry is None or time.monotonic() - entry[1] >= self.ttl_seconds or not accept(entry[0]):
+      return None
+    self.hits += 1
+    self._entries.move_to_end(key)
+    return entry[0]
+
+  def _set(self, key: Hashable, value: Any) -> None:
+    self._entries[key] = (value, time.monotonic())
+    self._entries.move_to_end(key)
+    while len(self._entries) > self.max_size:
+      self._discard(next(iter(self._entries)))
+
+  def _discard(self, key: Hashable) -> None:
+    self._entries.pop(key, None)
+    self.evictions += 1
+
+  def invalidate(self, key: Hashable) -> None:
+    """Drop ``key`` (e.g. after the row was updated or deleted)."""
+    self._entries.pop(key, None)
+    self._loading.pop(key, None)
+
+  def clear(self) -> None:
+    """Drop every entry."""
+    self._entries.clear()
+    self._loading.clear()
+
+  def approx_bytes(self) -> int:
+    """Rough memory held by cached values (shallow size of each value and its attributes)."""
+    total = sys.getsizeof(self._entries)
+    for value, _ in self._entries.values():
+      total += sys.getsizeof(value)
+      attrs = getattr(value, "__dict__", None)
+      if attrs:
+        total += sum(sys.getsizeof(v) for v in attrs.values())
+    return total
+
+  def stats(self) -> Dict[str, Any]:
+    """Return hit/miss counters, current size and approximate memory use."""
+    lookups = self.hits + self.misses + self.coalesced
+    return {
+      "size": len(self._entries),
+      "max_size": self.max_size,
+      "hits": self.hits,
+      "misses": self.misses,
+      "coalesced": self.coalesced,
+      "evictions": self.evictions,
+      "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+      "approx_bytes": self.approx_bytes(),
+    }
+
+
+# Every cache created through ``read_cache``, keyed by name, for reporting
+caches: Dict[str, ReadThroughCache] = {}
+
+
+def read_cache(name: str, max_size: int, ttl_seconds: float) -> ReadThroughCache:
+  """Create (or return) the named cache."""
+  cache = caches.get(name)
+  if cache is None:
+    cache = caches[name] = ReadThroughCache(name, max_size, ttl_seconds)
+  return cache
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+  """Return ``stats()`` for every registered cache."""
+  return {name: cache.stats() for name, cache in caches.items()}
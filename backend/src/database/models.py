@@ -1,6 +1,7 @@
 import logging
 import uuid as uuid_pkg
 from datetime import datetime, timezone
+from typing import Optional
 
 from sqlalchemy import DateTime, text
 from sqlalchemy.dialects.postgresql import UUID
@@ -8,6 +9,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.future import select
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+from .cache import ReadThroughCache
 from .postgres import async_session
 
 
@@ -22,7 +24,7 @@ class UUIDMixin:
 class TimestampMixin:
   created_at: Mapped[datetime] = mapped_column(
     DateTime(timezone=True),
-    default=datetime.now(timezone.utc),
+    default=lambda: datetime.now(timezone.utc),
     server_default=text("CURRENT_TIMESTAMP"),
   )
 
@@ -45,6 +47,10 @@ class CRUD(Base, UUIDMixin, TimestampMixin):
 
   __abstract__ = True
 
+  # Models that are read far more often than written opt into caching ``read``.
+  # Cached instances are detached and shared; treat them as read-only.
+  __read_cache__: Optional[ReadThroughCache] = None
+
   async def create(self):
     async with async_session() as session:
       session.add(self)
@@ -52,8 +58,28 @@ class CRUD(Base, UUIDMixin, TimestampMixin):
       return self
 
   @classmethod
-  async def read(cls, _id: uuid_pkg.UUID):
-    """Read a record from the database."""
+  async def read(cls, _id: uuid_pkg.UUID, cached: bool = True):
+    """Read a record, through the model's read cache if it has one.
+
+    Args:
+      _id: Primary key
+      cached: Set to False to bypass a cached copy (the fresh row replaces it)
+    """
+    cache = cls.__read_cache__
+    if cache is None:
+      return await cls._read(_id)
+    if not cached:
+      cache.invalidate(_id)
+    return await cache.get(_id, lambda: cls._read(_id))
+
+  @classmethod
+  def invalidate(cls, _id: uuid_pkg.UUID) -> None:
+    """Drop a cached record after it was changed outside ``update``/``delete``."""
+    if cls.__read_cache__ is not None:
+      cls.__read_cache__.invalidate(_id)
+
+  @classmethod
+  async def _read(cls, _id: uuid_pkg.UUID):
     async with async_session() as session:
       try:
         # Ensure the query is correctly formed
@@ -98,6 +124,7 @@ class CRUD(Base, UUIDMixin, TimestampMixin):
         setattr(self, attr, value)
       session.add(self)
       await session.commit()
+      self.invalidate(self.id)
       return self
 
   async def delete(self):
@@ -105,6 +132,7 @@ class CRUD(Base, UUIDMixin, TimestampMixin):
     async with async_session() as session:
       await session.delete(self)
       await session.commit()
+    self.invalidate(self.id)
 
   async def replace(self, **kwargs):
     """Replace a record in the database."""
@@ -115,4 +143,5 @@ class CRUD(Base, UUIDMixin, TimestampMixin):
         setattr(self, attr, value)
       session.add(self)
       await session.commit()
+      self.invalidate(self.id)
       return self
@@ -1,26 +1,47 @@
+import asyncio
+from contextlib import AsyncExitStack
 from typing import AsyncGenerator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from config.settings import settings
+from libs.metrics import instrument_pool
 
 # Async engine and session (for FastAPI endpoints)
 async_engine = create_async_engine(
   settings.database_url,
   echo=False,
   poolclass=AsyncAdaptedQueuePool,
-  pool_size=5,
-  max_overflow=10,
-  pool_timeout=30,
+  pool_size=settings.db_pool_size,
+  max_overflow=settings.db_max_overflow,
+  pool_timeout=settings.db_pool_timeout,
   pool_pre_ping=True,
 )
+instrument_pool(async_engine.sync_engine, "app")
 
 # Fixed sessionmaker configuration
 async_session = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
 
 async def get_db():
   async with async_session() as session:
-    yield session
\ No newline at end of file
+    yield session
+
+
+async def warmup(connections: int) -> None:
+  """Open up to ``connections`` pooled connections and check each with a trivial query."""
+  connections = min(connections, settings.db_pool_size)
+  async with AsyncExitStack() as stack:
+    # Hold them all at once so the pool really creates that many
+    conns = await asyncio.gather(
+      *(stack.enter_async_context(async_engine.connect()) for _ in range(connections))
+    )
+    for conn in conns:
+      await conn.execute(text("SELECT 1"))
+
+
+async def dispose() -> None:
+  """Close every pooled connection (on shutdown, after requests have drained)."""
+  await async_engine.dispose()
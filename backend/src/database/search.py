@@ -0,0 +1,53 @@
+"""Postgres full-text search helpers.
+
+``stories.search_vector`` and ``conversation_messages.search_vector`` are
+kept current by triggers (migration 11), so writers never touch them.
+Searches rank every match, keyset-paginate on ``(rank, id)`` and only build
+``ts_headline`` snippets for the rows of the returned page.
+"""
+import html
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.sql import ColumnElement
+
+from libs.utils import decode_rank_cursor
+
+# Text search configuration used by the triggers; queries must match it
+SEARCH_CONFIG = "english"
+
+# ts_headline returns the text unescaped, so matches are marked with private-use
+# characters (removed from the text first) and the snippet is escaped in Python
+_START, _STOP = "\ue000", "\ue001"
+HEADLINE_OPTIONS = (
+  f"StartSel={_START}, StopSel={_STOP}, MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=\" … \""
+)
+
+
+def parse_query(q: str) -> ColumnElement:
+  """Turn free text ("farm" -city, "apple pie") into a tsquery; never raises on syntax."""
+  return func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+
+def matches(vector, tsquery) -> ColumnElement:
+  return vector.op("@@")(tsquery)
+
+
+def rank(vector, tsquery) -> ColumnElement:
+  return func.ts_rank(vector, tsquery)
+
+
+def headline(column, tsquery) -> ColumnElement:
+  """Snippet of ``column`` around the matches; pass the result through ``render_headline``."""
+  text = func.replace(func.replace(column, _START, ""), _STOP, "")
+  return func.ts_headline(SEARCH_CONFIG, text, tsquery, HEADLINE_OPTIONS)
+
+
+def render_headline(snippet: str) -> str:
+  """HTML-escape a ``headline`` snippet and wrap its matched words in <mark>."""
+  return html.escape(snippet).replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+def after_cursor(rank_expr, id_column, cursor: str) -> ColumnElement:
+  """Filter for rows after a ``(rank, id)`` cursor. Raises ValueError if invalid."""
+  cursor_rank, cursor_id = decode_rank_cursor(cursor)
+  return tuple_(rank_expr, id_column) < (cursor_rank, cursor_id)
@@ -0,0 +1,7 @@
+"""Gunicorn hooks used by ``python src/app.py`` (passed with ``--config``)."""
+from prometheus_client import multiprocess
+
+
+def child_exit(server, worker):
+  # Drop the dead worker's live gauges (SSE streams, pool checkouts) from /metrics
+  multiprocess.mark_process_dead(worker.pid)
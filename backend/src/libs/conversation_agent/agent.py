@@ -1,27 +1,80 @@
-from typing import Any, AsyncGenerator
+import asyncio
+from contextlib import ExitStack
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Any, AsyncGenerator
 from uuid import UUID
 
-from agno.agent import Agent
-from agno.db.postgres import PostgresDb
-from agno.models.google import Gemini
+from sqlalchemy import text
 
 from config.settings import settings
+from libs.conversation_agent.pool import AgentPool
+from libs.llm.provider import build_model, prime_model
+from libs.metrics import instrument_pool
+from libs.tracing import active, stages
 
+if TYPE_CHECKING:
+    from agno.agent import Agent
+    from agno.db.postgres import PostgresDb
+    from agno.models.base import Model
 
 
 class ConversationAgentFactory:
     """Factory for creating conversation agents with different LLM providers."""
 
     def __init__(self):
-        # Configure storage for conversation persistence
+        self.pool = AgentPool(
+            max_size=settings.agent_pool_size,
+            ttl_seconds=settings.agent_pool_ttl_seconds,
+        )
+
+    # agno and google-genai take over a second to import, so they are loaded
+    # on first use rather than when the service module is imported
+
+    @cached_property
+    def storage(self) -> "PostgresDb":
+        """Agno storage for conversation persistence."""
+        from agno.db.postgres import PostgresDb
+
         db_url = settings.database_url.replace("postgresql+asyncpg://", "postgresql+psycopg://")
-        self.storage = PostgresDb(
+        storage = PostgresDb(
             session_table="__agno_conversation_sessions",
             db_url=db_url,
             db_schema="public"
         )
+        instrument_pool(storage.db_engine, "agno")
+        return storage
 
-    def _build_instructions(self, grandparent_name: str) -> str:
+    @cached_property
+    def model(self) -> "Model":
+        """One model (and therefore one provider client) shared by every agent."""
+        return build_model()
+
+    async def warmup(self, connections: int, prime_llm: bool) -> None:
+        """Open Agno's storage connections and optionally prime the model client.
+
+        Args:
+            connections: Number of storage connections to open and check
+            prime_llm: Also open the model client's HTTPS connection
+        """
+        await asyncio.to_thread(self._warm_storage, connections)
+        if prime_llm:
+            await prime_model(self.model)
+
+    def _warm_storage(self, connections: int) -> None:
+        # Agno's PostgresDb uses its own synchronous psycopg engine
+        with ExitStack() as stack:
+            conns = [stack.enter_context(self.storage.db_engine.connect()) for _ in range(connections)]
+            for conn in conns:
+                conn.execute(text("SELECT 1"))
+
+    def close(self) -> None:
+        """Close Agno's storage connections, if storage was ever used."""
+        if "storage" in self.__dict__:
+            self.storage.db_engine.dispose()
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _build_instructions(grandparent_name: str) -> str:
         """Build conversation instructions for the agent."""
         return f"""You are a caring, patient grandchild having a conversation with {grandparent_name}.
 
@@ -60,7 +113,8 @@ Keep responses concise and conversational."""
         chat_session_id: str | UUID,
         grandparent_name: str,
         message: str,
-        memory_size: int = 100,
+        memory_size: int | None = None,
+        summary: str | None = None,
     ) -> AsyncGenerator[Any, None]:
         """Stream conversation responses using Agno agent.
 
@@ -72,29 +126,93 @@ Keep responses concise and conversational."""
             llm: The LLM model identifier
             provider: The LLM provider (openai, anthropic, deepseek, google)
             assets: Optional files or images
-            memory_size: Number of previous messages to remember
+            memory_size: Number of previous turns kept verbatim (defaults to settings)
+            summary: Rolling summary of turns older than the verbatim window
             temperature: LLM temperature setting
             max_tokens: Maximum tokens in response
             top_p: Top-p sampling parameter
 
         Yields:
-            Streaming response tokens
+            Streaming content events
+        """
+
+        from agno.agent import Agent
+        from agno.run.agent import RunEvent
+
+        session_id = str(chat_session_id)
+        memory_size = memory_size or settings.chat_history_turns
+
+        def build_agent() -> "Agent":
+            # Create agent with storage for memory retention
+            return Agent(
+                model=self.model,
+                db=self.storage,
+                markdown=True,
+                stream=True,
+                add_history_to_context=True,
+                session_id=session_id,
+                num_history_runs=memory_size,
+                instructions=self._build_instructions(grandparent_name),
+            )
+
+        # Stage timing for traced requests. Agno loads the session and history
+        # before RunStarted and saves the run after the last token.
+        timing = stages("agent.acquire")
+        first_token = True
+        try:
+            # Reuse the session's agent; the pool serializes turns on the same session
+            key = (session_id, grandparent_name, memory_size)
+            async with self.pool.acquire(key, build_agent) as agent:
+                timing.next("agent.load_history")
+                # Safe to mutate: the pool hands this agent to one turn at a time
+                agent.additional_context = (
+                    f"Summary of the earlier conversation:\n{summary}" if summary else None
+                )
+                async for chunk in agent.arun(
+                    message,
+                    stream=True,
+                    session_id=session_id,
+                    stream_intermediate_steps=active(),
+                ):
+                    if chunk.event == RunEvent.run_started.value:
+                        timing.next("llm.first_token")
+                    # Only model output; tool and reasoning events are dropped by type
+                    elif chunk.event == RunEvent.run_content.value:
+                        if first_token:
+                            timing.next("llm.stream")
+                            first_token = False
+                        yield chunk
+                timing.next("agent.save")
+        finally:
+            timing.end()
+
+    async def summarize(self, summary: str | None, transcript: str, max_tokens: int) -> str:
+        """Fold new conversation turns into a rolling summary.
+
+        Args:
+            summary: The current summary, if any
+            transcript: Turns that fell out of the verbatim window
+            max_tokens: Approximate token budget for the new summary
+
+        Returns:
+            Updated summary text
         """
+        from agno.agent import Agent
 
-        # Create agent with storage for memory retention
         agent = Agent(
-            model=Gemini(id="gemini-2.5-flash"),
-            db=self.storage,
-            markdown=True,
-            stream=True,
-            add_history_to_context=True,
-            read_chat_history=True,
-            session_id=str(chat_session_id),
-            num_history_runs=memory_size,
-            instructions=self._build_instructions(grandparent_name),
+            model=self.model,
+            instructions=(
+                "You maintain a running summary of an interview between a grandchild and a grandparent. "
+                "Merge the new turns into the existing summary. Keep names, places, dates, topics already "
+                "covered and memorable quotes. Write plain prose in the third person, at most "
+                f"{int(max_tokens * 0.75)} words."
+            ),
         )
+        prompt = f"Existing summary:\n{summary or '(none)'}\n\nNew turns:\n{transcript}"
+        response = await agent.arun(prompt)
+        return response.content  # type: ignore
 
-        # Stream response from agent
-        async for chunk in agent.arun(message, stream=True):
-            yield chunk
+    def pool_stats(self) -> dict:
+        """Return agent pool hit/miss counters."""
+        return self.pool.stats()
 
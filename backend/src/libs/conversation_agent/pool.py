@@ -0,0 +1,91 @@
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Tuple
+
+
+class AgentPool:
+    """Bounded LRU/TTL cache of Agno agents.
+
+    Agents are keyed by whatever the caller considers identical configuration
+    (e.g. chat session id + grandparent name). Each key has its own lock so
+    concurrent turns on the same session are serialized while different
+    sessions stream in parallel. A key's lock lives while any turn holds or
+    waits for it, independently of the cached agent.
+    """
+
+    def __init__(self, max_size: int = 256, ttl_seconds: float = 1800.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        # Turns holding or waiting for each key's lock
+        self._lock_users: Dict[Hashable, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[1] < self.ttl_seconds:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            self._entries[key] = (entry[0], now)
+            return entry[0]
+
+        self.misses += 1
+        agent = factory()
+        self._entries[key] = (agent, now)
+        self._entries.move_to_end(key)
+        self._evict(now)
+        return agent
+
+    def _evict(self, now: float) -> None:
+        # Expired entries first, then least recently used until within bounds
+        for key in [k for k, (_, ts) in self._entries.items() if now - ts >= self.ttl_seconds]:
+            self._discard(key)
+        while len(self._entries) > self.max_size:
+            key = next(iter(self._entries))
+            self._discard(key)
+
+    def _discard(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+        self.evictions += 1
+
+    @asynccontextmanager
+    async def acquire(self, key: Hashable, factory: Callable[[], Any]) -> AsyncIterator[Any]:
+        """Borrow the agent for ``key``, building it with ``factory`` on a miss.
+
+        The agent is held exclusively for the duration of the context.
+        """
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                yield self._get(key, factory)
+        finally:
+            self._lock_users[key] -= 1
+            if not self._lock_users[key]:
+                del self._lock_users[key]
+                del self._locks[key]
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a cached agent (e.g. after its configuration changed)."""
+        if key in self._entries:
+            self._discard(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,102 @@
+"""Text embedders for the related-memories index.
+
+An embedder turns texts into a ``float32`` matrix with one row per text.
+It may also derive per-dimension weights from the whole index (for TF-IDF,
+the IDF), which are applied to stored vectors and queries alike before
+scoring. The default, :class:`HashedTfidfEmbedder`, needs nothing beyond
+NumPy and never calls out of the process.
+
+Another embedder (e.g. a sentence-transformer) only has to implement
+``name``, ``dim``, ``embed`` and ``weights`` and be registered in
+``EMBEDDERS``. Rows are stored with the embedder's name, so switching
+embedders re-indexes instead of mixing vector spaces.
+"""
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Protocol, Sequence
+
+import numpy as np
+
+from config.settings import settings
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+STOPWORDS = frozenset(
+    "a an and are as at be been but by did do does for from had has have he her him his how i if in into "
+    "is it its me my no not of on or our she so than that the their them then there they this to too up "
+    "us was we were what when where which who why will with would you your".split()
+)
+
+
+def stem(word: str) -> str:
+    """Fold plurals ("apples", "berries") onto the singular; cheap, not a full stemmer."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+class Embedder(Protocol):
+    name: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return a ``(len(texts), dim)`` float32 matrix."""
+        ...
+
+    def weights(self, matrix: np.ndarray) -> np.ndarray | None:
+        """Per-dimension weights derived from the indexed vectors, if any."""
+        ...
+
+
+class HashedTfidfEmbedder:
+    """Hashed TF-IDF over words and word pairs.
+
+    Each unigram and bigram (stopwords removed) is hashed with CRC32 into
+    ``dim`` buckets with a hash-derived sign, so collisions tend to cancel
+    out instead of adding up. Stored vectors hold sublinear term frequencies
+    (``1 + log tf``). The IDF is computed from the memory space's own index
+    when it is loaded, so adding a story never requires re-embedding the
+    others.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hashed-tfidf-{dim}"
+
+    def tokens(self, text: str) -> list[str]:
+        words = [stem(w.removesuffix("'s")) for w in _TOKEN.findall(text.lower()) if w not in STOPWORDS]
+        words = [w for w in words if len(w) > 1]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token, count in Counter(self.tokens(text)).items():
+                h = zlib.crc32(token.encode())
+                sign = 1.0 if h & 0x80000000 else -1.0
+                matrix[row, h % self.dim] += sign * (1.0 + math.log(count))
+        return matrix
+
+    def weights(self, matrix: np.ndarray) -> np.ndarray:
+        df = np.count_nonzero(matrix, axis=0)
+        return (np.log((1 + len(matrix)) / (1 + df)) + 1).astype(np.float32)
+
+
+EMBEDDERS = {
+    "hashed_tfidf": lambda: HashedTfidfEmbedder(settings.related_embedding_dim),
+}
+
+
+def get_embedder() -> Embedder:
+    """Build the embedder selected by ``settings.related_embedder``."""
+    return EMBEDDERS[settings.related_embedder]()
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length (zero rows stay zero) so dot products are cosines."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
@@ -0,0 +1,217 @@
+"""Archive writing and rendering for memory space exports.
+
+:class:`ZipStream` builds a ZIP archive front to back without seeking:
+each entry is followed by a data descriptor, so finished bytes can be
+handed to the client while later entries are still being written, and
+only the unsent bytes are ever held in memory.
+
+The formats render a story, or a transcript one message at a time, as a
+Markdown, HTML or EPUB (XHTML) document.
+"""
+import re
+import unicodedata
+import zipfile
+from datetime import datetime
+from html import escape
+from typing import IO
+
+# Transcript speakers, as in libs.utils.format_transcript
+GRANDCHILD = "Grandchild"
+
+
+class _Sink:
+    """Write-only file object that keeps what was written until drained."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self.pending = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self.pending += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        self.pending = 0
+        return data
+
+
+class ZipStream:
+    """ZIP archive written to memory incrementally and drained in chunks."""
+
+    def __init__(self):
+        self._sink = _Sink()
+        # The sink can't seek or tell, so zipfile writes data descriptors
+        self._zip = zipfile.ZipFile(self._sink, "w", compression=zipfile.ZIP_DEFLATED)
+
+    @property
+    def pending(self) -> int:
+        """Bytes written but not drained yet."""
+        return self._sink.pending
+
+    def open(self, name: str, modified: datetime | None = None, compress: bool = True) -> IO[bytes]:
+        """Open a new entry for writing; close it before opening the next one."""
+        info = zipfile.ZipInfo(name, date_time=(modified or datetime.now()).timetuple()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        return self._zip.open(info, "w")
+
+    def write(self, name: str, data: str | bytes, modified: datetime | None = None, compress: bool = True) -> None:
+        """Add an entry in one go."""
+        with self.open(name, modified, compress) as entry:
+            entry.write(data.encode() if isinstance(data, str) else data)
+
+    def drain(self) -> bytes:
+        """Return (and forget) the bytes written so far."""
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Write the central directory and return the remaining bytes."""
+        self._zip.close()
+        return self._sink.drain()
+
+
+def slugify(text: str, max_length: int = 60) -> str:
+    """ASCII file name part: "Summer at the Lake!" -> "summer-at-the-lake"."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    slug = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+    return slug[:max_length].rstrip("-") or "untitled"
+
+
+def markdown_to_html(text: str) -> str:
+    """Render the subset of Markdown stories use: headings, paragraphs and line breaks."""
+    blocks = []
+    for block in re.split(r"\n\s*\n", text.strip()):
+        heading = re.match(r"(#{1,6})\s+(.*)", block)
+        if heading:
+            # The document title is the <h1>, so story headings start one level below
+            level = min(len(heading.group(1)) + 1, 6)
+            blocks.append(f"<h{level}>{escape(heading.group(2).strip())}</h{level}>")
+        elif block:
+            lines = (escape(line.strip()) for line in block.splitlines())
+            blocks.append(f"<p>{'<br/>'.join(lines)}</p>")
+    return "\n".join(blocks)
+
+
+class MarkdownFormat:
+    extension = "md"
+    media_type = "application/zip"
+    archive_extension = "zip"
+
+    def story(self, title: str, content: str, topic: str, generated_at: datetime) -> str:
+        return f"# {title}\n\n*{topic} · {generated_at:%B %-d, %Y}*\n\n{content.strip()}\n"
+
+    def transcript_header(self, title: str) -> str:
+        return f"# {title}\n\n"
+
+    def message(self, speaker: str, content: str) -> str:
+        return f"**{speaker}:** {content.strip()}\n\n"
+
+    def transcript_footer(self) -> str:
+        return ""
+
+    def index(self, title: str, entries: list[tuple[str, str]]) -> str:
+        lines = "".join(f"- [{name}]({path})\n" for path, name in entries)
+        return f"# {title}\n\n{lines}"
+
+
+class HtmlFormat(MarkdownFormat):
+    extension = "html"
+
+    def document_start(self, title: str) -> str:
+        return (
+            '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8"/>\n'
+            f"<title>{escape(title)}</title>\n</head>\n<body>\n<h1>{escape(title)}</h1>\n"
+        )
+
+    def document_end(self) -> str:
+        return "</body>\n</html>\n"
+
+    def story(self, title: str, content: str, topic: str, generated_at: datetime) -> str:
+        return (
+            self.document_start(title)
+            + f"<p><em>{escape(topic)} · {generated_at:%B %-d, %Y}</em></p>\n"
+            + markdown_to_html(content)
+            + "\n"
+            + self.document_end()
+        )
+
+    def transcript_header(self, title: str) -> str:
+        return self.document_start(title)
+
+    def message(self, speaker: str, content: str) -> str:
+        lines = "<br/>".join(escape(line) for line in content.strip().splitlines())
+        return f"<p><strong>{escape(speaker)}:</strong> {lines}</p>\n"
+
+    def transcript_footer(self) -> str:
+        return self.document_end()
+
+    def index(self, title: str, entries: list[tuple[str, str]]) -> str:
+        items = "".join(f'<li><a href="{escape(path)}">{escape(name)}</a></li>\n' for path, name in entries)
+        return self.document_start(title) + f"<ul>\n{items}</ul>\n" + self.document_end()
+
+
+class EpubFormat(HtmlFormat):
+    """EPUB 3: XHTML chapters, with the package document and navigation written last."""
+
+    extension = "xhtml"
+    media_type = "application/epub+zip"
+    archive_extension = "epub"
+
+    CONTAINER = (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">\n'
+        '<rootfiles><rootfile full-path="content.opf" media-type="application/oebps-package+xml"/></rootfiles>\n'
+        "</container>\n"
+    )
+
+    def start(self, archive: ZipStream) -> None:
+        # The mimetype must be the first entry, uncompressed
+        archive.write("mimetype", self.media_type, compress=False)
+        archive.write("META-INF/container.xml", self.CONTAINER)
+
+    def document_start(self, title: str) -> str:
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>\n<!DOCTYPE html>\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="en">\n'
+            f"<head>\n<meta charset=\"utf-8\"/>\n<title>{escape(title)}</title>\n</head>\n"
+            f"<body>\n<h1>{escape(title)}</h1>\n"
+        )
+
+    def index(self, title: str, entries: list[tuple[str, str]]) -> str:
+        items = "".join(f'<li><a href="{escape(path)}">{escape(name)}</a></li>\n' for path, name in entries)
+        return (
+            self.document_start(title)
+            + f'<nav epub:type="toc" id="toc"><ol>\n{items}</ol></nav>\n'
+            + self.document_end()
+        )
+
+    def package(self, identifier: str, title: str, modified: datetime, paths: list[str]) -> str:
+        """content.opf: metadata, every chapter in the manifest and in reading order."""
+        manifest = "".join(
+            f'<item id="c{i}" href="{escape(path)}" media-type="application/xhtml+xml"/>\n'
+            for i, path in enumerate(paths)
+        )
+        spine = "".join(f'<itemref idref="c{i}"/>\n' for i in range(len(paths)))
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="id">\n'
+            '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+            f'<dc:identifier id="id">urn:uuid:{identifier}</dc:identifier>\n'
+            f"<dc:title>{escape(title)}</dc:title>\n<dc:language>en</dc:language>\n"
+            f'<meta property="dcterms:modified">{modified:%Y-%m-%dT%H:%M:%SZ}</meta>\n'
+            "</metadata>\n<manifest>\n"
+            '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>\n'
+            f"{manifest}</manifest>\n<spine>\n{spine}</spine>\n</package>\n"
+        )
+
+
+FORMATS = {
+    "markdown": MarkdownFormat,
+    "html": HtmlFormat,
+    "epub": EpubFormat,
+}
@@ -0,0 +1,60 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from the values that determine a response body."""
+    digest = hashlib.blake2b("\x1f".join(str(part) for part in parts).encode(), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the current validators.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when
+    the request has no If-None-Match, as RFC 9110 requires.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: a W/ prefix added by a proxy still matches
+        candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+        return etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def cache_headers(
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = "no-cache",
+) -> dict[str, str]:
+    """Return the ETag / Last-Modified / Cache-Control headers for a response."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def not_modified_response(headers: dict[str, str]) -> Response:
+    """Empty 304 carrying the same validators and caching policy as a 200."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -0,0 +1,153 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator
+
+from agno.exceptions import ModelProviderError
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.models.response import ModelResponse
+
+from config.settings import settings
+
+_WORDS = (
+    "the summer we moved to the farm my father planted apple trees along the lane and every "
+    "evening we walked down to the river where my mother told stories about her own childhood"
+).split()
+
+
+@dataclass
+class FakeModel(Model):
+    """Local stand-in model that streams synthetic tokens.
+
+    Nothing leaves the process: each response waits ``ttft`` seconds, then
+    produces ``tokens`` words ``token_delay`` seconds apart, each delay
+    jittered by up to ``jitter`` seconds either way. With probability
+    ``error_rate`` a response fails with ``ModelProviderError`` at a random
+    point, mid-stream included. ``prefill`` adds time to first token per
+    1000 prompt characters, as providers take longer to read long prompts.
+    Agno still loads and saves sessions, so the database side of chat and
+    story requests behaves as in production.
+    """
+
+    id: str = "fake"
+    name: str = "FakeModel"
+    provider: str = "Fake"
+
+    ttft: float = 0.4
+    token_delay: float = 0.02
+    jitter: float = 0.005
+    error_rate: float = 0.0
+    tokens: int = 200
+    prefill: float = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "FakeModel":
+        return cls(
+            ttft=settings.fake_llm_ttft_ms / 1000,
+            token_delay=settings.fake_llm_token_delay_ms / 1000,
+            jitter=settings.fake_llm_jitter_ms / 1000,
+            error_rate=settings.fake_llm_error_rate,
+            tokens=settings.fake_llm_tokens,
+            prefill=settings.fake_llm_prefill_ms_per_1k_chars / 1000,
+        )
+
+    def _delay(self, base: float) -> float:
+        return max(0.0, base + random.uniform(-self.jitter, self.jitter))
+
+    def _prefill(self, messages: list[Message]) -> float:
+        return self.prefill * sum(len(m.content) for m in messages if isinstance(m.content, str)) / 1000
+
+    def _plan(self) -> tuple[list[str], int | None]:
+        """Return the response's tokens and the index to fail at, if any."""
+        # A short first line, so story responses split into a title and a body
+        words = ["Synthetic response\n\n"]
+        for i in range(max(self.tokens - 1, 1)):
+            word = _WORDS[i % len(_WORDS)]
+            words.append(f"{word}.\n\n" if i % 60 == 59 else f"{word} ")
+        fail_at = random.randrange(len(words)) if random.random() < self.error_rate else None
+        return words, fail_at
+
+    def _error(self) -> ModelProviderError:
+        return ModelProviderError("Injected fake model failure", status_code=503, model_name=self.name, model_id=self.id)
+
+    async def ainvoke_stream(
+        self,
+        messages: list[Message],
+        assistant_message: Message,
+        run_response: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ModelResponse]:
+        words, fail_at = self._plan()
+        assistant_message.metrics.start_timer()
+        await asyncio.sleep(self._delay(self.ttft) + self._prefill(messages))
+        if run_response is not None and run_response.metrics:
+            run_response.metrics.set_time_to_first_token()
+
+        for i, word in enumerate(words):
+            if i == fail_at:
+                raise self._error()
+            if i:
+                await asyncio.sleep(self._delay(self.token_delay))
+            yield ModelResponse(role="assistant", content=word)
+
+        assistant_message.metrics.stop_timer()
+
+    async def ainvoke(
+        self,
+        messages: list[Message],
+        assistant_message: Message,
+        run_response: Any = None,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        words, fail_at = self._plan()
+        assistant_message.metrics.start_timer()
+        await asyncio.sleep(self._delay(self.ttft) + self._prefill(messages) + self.token_delay * (len(words) - 1))
+        if fail_at is not None:
+            raise self._error()
+        assistant_message.metrics.stop_timer()
+        return ModelResponse(role="assistant", content="".join(words))
+
+    def invoke_stream(
+        self,
+        messages: list[Message],
+        assistant_message: Message,
+        run_response: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ModelResponse]:
+        words, fail_at = self._plan()
+        assistant_message.metrics.start_timer()
+        time.sleep(self._delay(self.ttft) + self._prefill(messages))
+        if run_response is not None and run_response.metrics:
+            run_response.metrics.set_time_to_first_token()
+
+        for i, word in enumerate(words):
+            if i == fail_at:
+                raise self._error()
+            if i:
+                time.sleep(self._delay(self.token_delay))
+            yield ModelResponse(role="assistant", content=word)
+
+        assistant_message.metrics.stop_timer()
+
+    def invoke(
+        self,
+        messages: list[Message],
+        assistant_message: Message,
+        run_response: Any = None,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        words, fail_at = self._plan()
+        assistant_message.metrics.start_timer()
+        time.sleep(self._delay(self.ttft) + self._prefill(messages) + self.token_delay * (len(words) - 1))
+        if fail_at is not None:
+            raise self._error()
+        assistant_message.metrics.stop_timer()
+        return ModelResponse(role="assistant", content="".join(words))
+
+    def _parse_provider_response(self, response: ModelResponse, **kwargs) -> ModelResponse:
+        return response
+
+    def _parse_provider_response_delta(self, response: ModelResponse) -> ModelResponse:
+        return response
@@ -0,0 +1,37 @@
+"""Model provider selection.
+
+``settings.llm_provider`` picks the Agno model both agent factories use:
+``gemini`` for production, ``fake`` for offline load and chaos tests
+(see ``libs/llm/fake.py``). Providers are imported only when selected.
+"""
+import asyncio
+from typing import TYPE_CHECKING
+
+from config.settings import settings
+
+if TYPE_CHECKING:
+    from agno.models.base import Model
+
+
+def build_model() -> "Model":
+    """Build the configured model."""
+    if settings.llm_provider == "fake":
+        from libs.llm.fake import FakeModel
+
+        return FakeModel.from_settings()
+
+    from agno.models.google import Gemini
+
+    return Gemini(id=settings.llm_model_id)
+
+
+async def prime_gemini(model: "Model") -> None:
+    """Open the Gemini client's HTTPS connection with a metadata request (no tokens used)."""
+    client = model.get_client()
+    await asyncio.wait_for(client.aio.models.get(model=model.id), settings.warmup_llm_timeout)
+
+
+async def prime_model(model: "Model") -> None:
+    """Open the provider's connection ahead of the first request, if it has one."""
+    if settings.llm_provider == "gemini":
+        await prime_gemini(model)
@@ -0,0 +1,131 @@
+"""Prometheus metrics.
+
+With gunicorn, ``app.py`` points ``PROMETHEUS_MULTIPROC_DIR`` at a fresh
+directory before the workers start, so every worker writes its samples there
+and ``/metrics`` aggregates all of them whichever worker serves the scrape.
+Without it (``--dev``), the in-process default registry is used.
+"""
+import os
+import time
+from typing import AsyncIterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route (streaming responses: until the last byte)",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+
+CHAT_TTFT = Histogram(
+    "chat_time_to_first_token_seconds",
+    "Time from the start of the agent run to the first streamed token in post_chat",
+    buckets=(0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10, 20),
+)
+
+CHAT_TOKENS_PER_SECOND = Histogram(
+    "chat_output_tokens_per_second",
+    "Chat output rate after the first token, estimated at 4 characters per token",
+    buckets=(5, 10, 20, 40, 60, 80, 100, 150, 200, 300, 500),
+)
+
+STORY_GENERATION = Histogram(
+    "story_generation_duration_seconds",
+    "Story generation time by mode (job or stream) and outcome",
+    ["mode", "outcome"],
+    buckets=(1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300),
+)
+
+SSE_STREAMS = Gauge(
+    "sse_streams_in_flight",
+    "SSE responses currently streaming",
+    ["stream"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections checked out of the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Checked-out connections beyond pool_size",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+
+def instrument_pool(engine: Engine, name: str) -> None:
+    """Keep the pool gauges for ``engine`` current on every checkout and checkin."""
+    size = engine.pool.size()
+    checked_out = 0
+
+    # Counted here rather than read from the pool: the checkin event fires
+    # before the pool's own counters are updated
+    def update(delta: int) -> None:
+        nonlocal checked_out
+        checked_out += delta
+        DB_POOL_CHECKED_OUT.labels(pool=name).set(checked_out)
+        DB_POOL_OVERFLOW.labels(pool=name).set(max(checked_out - size, 0))
+
+    event.listen(engine, "checkout", lambda *_: update(1))
+    event.listen(engine, "checkin", lambda *_: update(-1))
+    update(0)
+
+
+class ChatStreamTimer:
+    """Time-to-first-token and output rate of one streamed chat response."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.first_token_at: float | None = None
+        self.chars = 0
+
+    def token(self, text: str) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+            CHAT_TTFT.observe(self.first_token_at - self.start)
+        else:
+            # The rate is measured after the first token, so TTFT doesn't skew it
+            self.chars += len(text)
+
+    def finish(self) -> None:
+        if self.first_token_at is None or not self.chars:
+            return
+        elapsed = time.perf_counter() - self.first_token_at
+        if elapsed > 0:
+            CHAT_TOKENS_PER_SECOND.observe(self.chars / 4 / elapsed)
+
+
+async def track_stream(stream: str, events: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Count ``events`` in ``sse_streams_in_flight`` while it is being sent."""
+    gauge = SSE_STREAMS.labels(stream=stream)
+    gauge.inc()
+    try:
+        async for event in events:
+            yield event
+    finally:
+        gauge.dec()
+
+
+def render() -> tuple[bytes, str]:
+    """Return the exposition body and its content type."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
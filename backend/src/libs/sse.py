@@ -0,0 +1,109 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Compact encoder built once instead of per json.dumps call
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps(data: Any) -> str:
+    """Encode data as compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return _encoder.encode(data)
+
+
+def sse_event(data: dict) -> str:
+    """Format a dict as a single SSE ``data:`` frame."""
+    return f"data: {dumps(data)}\n\n"
+
+
+def token_event(content: str) -> str:
+    """Format a token frame without building an intermediate dict."""
+    return f'data: {{"type":"token","content":{dumps(content)}}}\n\n'
+
+
+_END = object()
+
+
+async def coalesce(
+    chunks: AsyncIterator[str],
+    interval: float,
+    max_chars: int,
+) -> AsyncIterator[str]:
+    """Batch small text chunks into fewer, larger ones.
+
+    The first chunk is passed through immediately so time-to-first-token is
+    unaffected. After that, text is buffered until ``interval`` seconds have
+    passed since the buffer started or it holds ``max_chars`` characters.
+    A buffered chunk is never held back waiting for the next one.
+
+    Args:
+        chunks: Source of text chunks
+        interval: Maximum time to hold buffered text, in seconds (0 disables batching)
+        max_chars: Flush as soon as this many characters are buffered
+
+    Yields:
+        Coalesced text chunks
+    """
+    if interval <= 0:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    buffer: list[str] = []
+    size = 0
+    timer = None
+
+    def flush() -> None:
+        nonlocal size, timer
+        if timer is not None:
+            timer.cancel()
+            timer = None
+        if buffer:
+            queue.put_nowait("".join(buffer))
+            buffer.clear()
+            size = 0
+
+    async def pump() -> None:
+        # Buffering happens here so the consumer only wakes once per batch
+        nonlocal size, timer
+        try:
+            first = True
+            async for chunk in chunks:
+                if first:
+                    first = False
+                    queue.put_nowait(chunk)
+                    continue
+                buffer.append(chunk)
+                size += len(chunk)
+                if size >= max_chars:
+                    flush()
+                elif timer is None:
+                    timer = loop.call_later(interval, flush)
+            flush()
+            queue.put_nowait(_END)
+        except Exception as e:
+            flush()
+            queue.put_nowait(e)
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        if timer is not None:
+            timer.cancel()
+        task.cancel()
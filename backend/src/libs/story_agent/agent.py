@@ -1,12 +1,73 @@
-from agno.agent import Agent
-from agno.models.google import Gemini
+import asyncio
+import logging
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, AsyncGenerator
 
+from config.settings import settings
+from libs.llm.provider import build_model, prime_model
+from libs.utils import format_transcript, split_transcript
 
+if TYPE_CHECKING:
+    from agno.agent import Agent
+    from agno.models.base import Model
+
+logger = logging.getLogger(__name__)
+
+# Replaces the transcript in the story prompt when notes were taken
+NOTES_PREAMBLE = (
+    "The conversation was too long to include in full. These are notes on each part "
+    "of the transcript, in order, with the grandparent's quotes kept word for word.\n\n"
+)
+# Precedes the input when the conversation is written up one topic at a time
+CHAPTER_PREAMBLE = (
+    'This is the "{chapter}" part of a longer conversation. Write the story of this chapter '
+    "of their life only.\n\n"
+)
 
 
 class StoryAgentFactory:
     """Factory for creating story generation agents with different LLM providers."""
 
+    @cached_property
+    def model(self) -> "Model":
+        """Shared model, imported on first use to keep startup fast."""
+        return build_model()
+
+    async def warmup(self) -> None:
+        """Open the model client's connection before the first job."""
+        await prime_model(self.model)
+
+    def _build_agent(self) -> "Agent":
+        from agno.agent import Agent
+
+        return Agent(
+            model=self.model,  # type: ignore
+            instructions=self._build_instructions(),
+            markdown=True,
+        )
+
+    def _build_notes_agent(self) -> "Agent":
+        from agno.agent import Agent
+
+        return Agent(
+            model=self.model,  # type: ignore
+            instructions=self._build_notes_instructions(),
+            markdown=True,
+        )
+
+    def _build_notes_instructions(self) -> str:
+        """Build instructions for taking notes on one part of a long transcript."""
+        return """You are helping a writer turn a long conversation between a grandchild and
+grandparent into a story. You are given one part of the transcript.
+
+Write notes on this part for the writer:
+- The events, in order, with the people, places, dates and ages mentioned
+- The grandparent's feelings and reflections
+- The most vivid quotes, word for word
+
+Only use what is in this part. Be concise, but leave out nothing the story would need.
+"""
+
     def _build_instructions(self) -> str:
         """Build story generation instructions for the agent."""
         return """You are a skilled writer transforming conversations into beautiful blog posts.
@@ -27,33 +88,88 @@ Style: Warm, respectful, celebrating their life story.
 Format your response as whatever you think is best as you are a skilled writer
 """
 
-    def generate_story(
+    async def prepare_input(self, messages, chapter: str | None = None) -> str:
+        """Build the story agent's input from conversation messages.
+
+        Short conversations are sent as the transcript itself. Longer ones
+        are split into windows of whole turns, notes are taken on the
+        windows concurrently (at most ``settings.story_map_concurrency`` at
+        once), and the story is written from the notes instead.
+
+        Args:
+            messages: Conversation messages (role, content) in order
+            chapter: Topic name when writing one chapter of the conversation
+
+        Returns:
+            The transcript, or the notes on its parts
+        """
+        preamble = CHAPTER_PREAMBLE.format(chapter=chapter) if chapter else ""
+        transcript = format_transcript(messages)
+        if len(transcript) <= settings.story_map_reduce_min_chars:
+            return preamble + transcript
+
+        windows = split_transcript(messages, settings.story_chunk_chars)
+        logger.info(f"Taking notes on {len(windows)} parts of a {len(transcript)} char transcript")
+        semaphore = asyncio.Semaphore(settings.story_map_concurrency)
+
+        async def take_notes(part: int, window: str) -> str:
+            async with semaphore:
+                response = await self._build_notes_agent().arun(f"Part {part} of {len(windows)}:\n\n{window}")
+                return response.content  # type: ignore
+
+        tasks = [asyncio.create_task(take_notes(part, window)) for part, window in enumerate(windows, 1)]
+        try:
+            notes = await asyncio.gather(*tasks)
+        except BaseException:
+            # One failed part fails the story; don't keep paying for the others
+            for task in tasks:
+                task.cancel()
+            raise
+        return preamble + NOTES_PREAMBLE + "\n\n".join(f"## Part {part}\n\n{text}" for part, text in enumerate(notes, 1))
+
+    async def generate_story(
         self,
-        conversation_transcript: str,
+        messages,
+        chapter: str | None = None,
     ) -> str:
-        """Generate a story from a conversation transcript.
+        """Generate a story from a conversation.
 
         Args:
-            conversation_transcript: The full conversation transcript
-            llm: The LLM model identifier
-            provider: The LLM provider (openai, anthropic, deepseek, google)
-            temperature: LLM temperature setting
-            max_tokens: Maximum tokens in response
-            top_p: Top-p sampling parameter
+            messages: Conversation messages (role, content) in order
+            chapter: Topic name when writing one chapter of the conversation
 
         Returns:
             Generated story with title and content
         """
-
+        story_input = await self.prepare_input(messages, chapter)
 
         # Create agent
-        agent = Agent(
-            model=Gemini(id="gemini-2.5-flash"),  # type: ignore
-            instructions=self._build_instructions(),
-            markdown=True,
-        )
+        agent = self._build_agent()
 
-        # Generate story
-        response = agent.run(conversation_transcript)
+        # Generate story without blocking the event loop
+        response = await agent.arun(story_input)
         return response.content  # type: ignore
 
+
+    async def stream_story(
+        self,
+        messages,
+    ) -> AsyncGenerator[Any, None]:
+        """Stream a story from a conversation.
+
+        Notes on long conversations are taken before the first token.
+
+        Args:
+            messages: Conversation messages (role, content) in order
+
+        Yields:
+            Streaming content events
+        """
+        from agno.run.agent import RunEvent
+
+        story_input = await self.prepare_input(messages)
+        agent = self._build_agent()
+
+        async for chunk in agent.arun(story_input, stream=True):
+            if chunk.event == RunEvent.run_content.value:
+                yield chunk
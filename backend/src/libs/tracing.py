@@ -0,0 +1,152 @@
+"""Lightweight per-request stage timing.
+
+``middleware/tracing.py`` gives every request an id and, for a sampled
+fraction (``settings.trace_sample_rate``), a :class:`Trace`. Code marks its
+stages with :func:`span` or :func:`stages`; when the request is not sampled
+both return shared no-op objects, so instrumented code costs one context
+variable lookup.
+
+A sampled request is logged as one JSON line on the ``libs.tracing`` logger
+and, for non-streaming responses, its spans are sent as ``Server-Timing``.
+"""
+import json
+import logging
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+trace_var: ContextVar["Trace | None"] = ContextVar("trace", default=None)
+
+
+def configure_logging() -> None:
+    """Write sampled traces to stderr at INFO.
+
+    Neither uvicorn nor gunicorn configures application loggers, so without
+    this ``libs.tracing`` inherits the root logger's WARNING level and every
+    trace is dropped.
+    """
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+class Trace:
+    """Spans recorded for one sampled request."""
+
+    __slots__ = ("request_id", "start", "spans")
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.start = time.perf_counter()
+        self.spans: list[tuple[str, float, float]] = []
+
+    def add(self, name: str, start: float, end: float) -> None:
+        self.spans.append((name, start, end))
+
+    def server_timing(self) -> str:
+        """Format the spans recorded so far as a ``Server-Timing`` header value."""
+        entries = [f"{name};dur={(end - start) * 1000:.1f}" for name, start, end in self.spans]
+        entries.append(f"app;dur={(time.perf_counter() - self.start) * 1000:.1f}")
+        return ", ".join(entries)
+
+    def log(self, **fields) -> None:
+        """Emit the whole request as one structured log line."""
+        record = {
+            "event": "request_trace",
+            "request_id": self.request_id,
+            **fields,
+            "duration_ms": round((time.perf_counter() - self.start) * 1000, 2),
+            "spans": [
+                {
+                    "name": name,
+                    "start_ms": round((start - self.start) * 1000, 2),
+                    "duration_ms": round((end - start) * 1000, 2),
+                }
+                for name, start, end in self.spans
+            ],
+        }
+        logger.info(json.dumps(record, separators=(",", ":")), extra={"request_id": self.request_id})
+
+
+class _Span:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self.trace.add(self.name, self.start, time.perf_counter())
+
+
+class _Stages:
+    """Consecutive stages of one operation; each ``next`` closes the previous stage."""
+
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name: str | None = name
+        self.start = time.perf_counter()
+
+    def next(self, name: str) -> None:
+        now = time.perf_counter()
+        if self.name is not None:
+            self.trace.add(self.name, self.start, now)
+        self.name, self.start = name, now
+
+    def end(self) -> None:
+        if self.name is not None:
+            self.trace.add(self.name, self.start, time.perf_counter())
+            self.name = None
+
+
+class _NoStages:
+    __slots__ = ()
+
+    def next(self, name: str) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+_NO_SPAN = nullcontext()
+_NO_STAGES = _NoStages()
+
+
+def active() -> bool:
+    """Whether the current request is being traced."""
+    return trace_var.get() is not None
+
+
+def span(name: str):
+    """Time a block as one span: ``with span("start_turn"): ...``"""
+    trace = trace_var.get()
+    if trace is None:
+        return _NO_SPAN
+    return _Span(trace, name)
+
+
+def stages(first: str):
+    """Time consecutive stages that do not nest as blocks (e.g. inside a stream).
+
+    Example:
+        timing = stages("llm.first_token")
+        ... timing.next("llm.stream") ...
+        timing.end()
+    """
+    trace = trace_var.get()
+    if trace is None:
+        return _NO_STAGES
+    return _Stages(trace, first)
@@ -1,4 +1,7 @@
+import base64
+import json
 import uuid
+from datetime import datetime
 from config.settings import settings
 
 
@@ -10,6 +13,38 @@ def create_bookmark_url(space_id: str, token: str) -> str:
     return f"{settings.app_base_url}/space/{space_id}?token={token}"
 
 
+def encode_cursor(generated_at: datetime, item_id: uuid.UUID) -> str:
+    """Encode a (generated_at, id) keyset position as an opaque cursor."""
+    raw = json.dumps([generated_at.isoformat(), str(item_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        generated_at, item_id = json.loads(raw)
+        return datetime.fromisoformat(generated_at), uuid.UUID(item_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_rank_cursor(rank: float, item_id: uuid.UUID) -> str:
+    """Encode a (search rank, id) keyset position as an opaque cursor."""
+    raw = json.dumps([rank, str(item_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, uuid.UUID]:
+    """Decode a cursor produced by encode_rank_cursor. Raises ValueError if invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        rank, item_id = json.loads(raw)
+        return float(rank), uuid.UUID(item_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
 def extract_excerpt(content: str, words: int = 100) -> str:
     word_list = content.split()
     if len(word_list) <= words:
@@ -17,6 +52,55 @@ def extract_excerpt(content: str, words: int = 100) -> str:
     return " ".join(word_list[:words]) + "..."
 
 
+def story_content_fields(content: str, words: int = 50) -> dict:
+    """Return content plus its precomputed excerpt and word count, for storing together."""
+    return {"content": content, "excerpt": extract_excerpt(content, words), "word_count": len(content.split())}
+
+
+def format_transcript(messages) -> str:
+    """Format conversation messages as a Grandparent/Grandchild transcript."""
+    transcript_lines = []
+    for msg in messages:
+        # USER = grandparent's messages, ASSISTANT = AI interviewer
+        role = "Grandparent" if msg.role == "user" else "Grandchild"
+        transcript_lines.append(f"{role}: {msg.content}")
+    return "\n\n".join(transcript_lines)
+
+
+def split_transcript(messages, max_chars: int) -> list[str]:
+    """Split a transcript into windows of whole turns of about ``max_chars``.
+
+    Windows start at a grandchild question so answers stay with their
+    question, unless the grandparent talks for twice the window size.
+    """
+    windows, current, size = [], [], 0
+    for msg in messages:
+        length = len(msg.content) + 15  # Speaker label and separator
+        at_question = msg.role != "user"
+        if current and ((size + length > max_chars and at_question) or size + length > 2 * max_chars):
+            windows.append(format_transcript(current))
+            current, size = [], 0
+        current.append(msg)
+        size += length
+    if current:
+        windows.append(format_transcript(current))
+    return windows
+
+
+def split_story_title(story_content: str) -> tuple[str, str]:
+    """Split generated story text into (title, content)."""
+    # Extract title from content (assuming first line or heading is title)
+    lines = story_content.strip().split("\n")
+    title = lines[0].strip().strip("#").strip() if lines else "Untitled Story"
+
+    # Remove title from content if it's in the first line
+    if lines and (lines[0].startswith("#") or len(lines[0]) < 100):
+        content = "\n".join(lines[1:]).strip()
+    else:
+        content = story_content
+    return title or "Untitled Story", content
+
+
 def parse_story_response(response: str) -> dict:
     lines = response.strip().split("\n")
     title = ""
@@ -1,13 +1,44 @@
-from fastapi import Request
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class ErrorHandlerMiddleware:
+    """Turn unhandled exceptions into a JSON 500 response.
+
+    Implemented as plain ASGI rather than ``BaseHTTPMiddleware``: ``send`` is
+    only wrapped to note whether the response has started, so bodies
+    (including SSE streams) are forwarded untouched without an extra task
+    or queue per request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            return JSONResponse(
+            if response_started:
+                # Too late for an error body; let the server drop the connection
+                raise
+            response = JSONResponse(
                 status_code=500,
                 content={"error": str(e), "type": type(e).__name__}
             )
+            await response(scope, receive, send)
+
+
+# Entry point picked up by Manager.register_middlewares
+Middleware = ErrorHandlerMiddleware
@@ -0,0 +1,67 @@
+import random
+import re
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.settings import settings
+from libs.tracing import Trace, request_id_var, trace_var
+
+# Incoming ids are echoed into logs and headers, so only accept plain tokens
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+
+class TracingMiddleware:
+    """Request ids for every request, stage timing for a sampled fraction.
+
+    The id comes from the caller's ``X-Request-ID`` header when it is a plain
+    token, otherwise a new one is generated; either way it is returned in
+    ``X-Request-ID``. Sampled requests get a ``Server-Timing`` header (except
+    event streams, whose headers go out before any stage has run) and are
+    logged with their spans once the response has been sent.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float | None = None):
+        self.app = app
+        self.sample_rate = settings.trace_sample_rate if sample_rate is None else sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("x-request-id", "")
+        if not REQUEST_ID_PATTERN.fullmatch(request_id):
+            request_id = uuid.uuid4().hex
+        trace = Trace(request_id) if self.sample_rate > 0 and random.random() < self.sample_rate else None
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                if trace is not None and not headers.get("content-type", "").startswith("text/event-stream"):
+                    headers.append("Server-Timing", trace.server_timing())
+            await send(message)
+
+        id_token = request_id_var.set(request_id)
+        trace_token = trace_var.set(trace)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            trace_var.reset(trace_token)
+            request_id_var.reset(id_token)
+            if trace is not None:
+                route = scope.get("route")
+                trace.log(
+                    method=scope["method"],
+                    route=getattr(route, "path", scope["path"]),
+                    status=status_code,
+                )
+
+
+# Entry point picked up by Manager.register_middlewares
+Middleware = TracingMiddleware
@@ -3,6 +3,7 @@ from .family_member import FamilyMember
 from .conversation_session import ConversationSession, TopicEnum, SessionStatus
 from .conversation_message import ConversationMessage, MessageRole
 from .story import Story, StoryStatus
+from .memory_embedding import MemoryEmbedding
 
 __all__ = [
     "MemorySpace",
@@ -14,4 +15,5 @@ __all__ = [
     "MessageRole",
     "Story",
     "StoryStatus",
+    "MemoryEmbedding",
 ]
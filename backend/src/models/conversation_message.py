@@ -1,7 +1,7 @@
 import enum
-from sqlalchemy import String, Text, Integer, ForeignKey
+from sqlalchemy import String, Text, Integer, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from database.models import CRUD
 
 
@@ -12,11 +12,16 @@ class MessageRole(str, enum.Enum):
 
 class ConversationMessage(CRUD):
     __tablename__ = "conversation_messages"
+    __table_args__ = (
+        UniqueConstraint("session_id", "sequence_number", name="uq_conversation_messages_session_sequence"),
+    )
 
     session_id: Mapped[UUID] = mapped_column(ForeignKey("conversation_sessions.id", ondelete="CASCADE"), nullable=False)
     role: Mapped[str] = mapped_column(String, nullable=False)  # Store as string, not enum
     content: Mapped[str] = mapped_column(Text, nullable=False)
     audio_url: Mapped[str] = mapped_column(String, nullable=True)
     sequence_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Full-text search vector of content, maintained by a trigger
+    search_vector: Mapped[str] = mapped_column(TSVECTOR, nullable=True, deferred=True)
 
     session = relationship("ConversationSession", back_populates="messages")
@@ -1,8 +1,10 @@
 import enum
 from datetime import datetime
-from sqlalchemy import String, Integer, Enum, DateTime, ForeignKey
+from sqlalchemy import String, Integer, Enum, DateTime, ForeignKey, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
+from config.settings import settings
+from database.cache import read_cache
 from database.models import CRUD
 
 
@@ -22,6 +24,13 @@ class SessionStatus(str, enum.Enum):
 
 class ConversationSession(CRUD):
     __tablename__ = "conversation_sessions"
+    # Counters change every turn; only immutable fields and the terminal
+    # COMPLETED status may be trusted from a cached copy
+    __read_cache__ = read_cache(
+        "conversation_sessions",
+        settings.conversation_session_cache_size,
+        settings.conversation_session_cache_ttl_seconds,
+    )
 
     memory_space_id: Mapped[UUID] = mapped_column(ForeignKey("memory_spaces.id"), nullable=False)
     topic: Mapped[TopicEnum] = mapped_column(Enum(TopicEnum), nullable=False)
@@ -30,7 +39,25 @@ class ConversationSession(CRUD):
     started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     completed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
     question_count: Mapped[int] = mapped_column(Integer, default=0)
+    # Highest allocated message sequence number; bumped atomically per turn
+    message_count: Mapped[int] = mapped_column(Integer, default=0)
+    # Rolling summary of messages up to and including summary_through
+    summary: Mapped[str] = mapped_column(Text, nullable=True)
+    summary_through: Mapped[int] = mapped_column(Integer, default=0)
 
     memory_space = relationship("MemorySpace", back_populates="sessions")
     messages = relationship("ConversationMessage", back_populates="session")
-    story = relationship("Story", back_populates="session", uselist=False)
+    # One story, or one per topic when written as chapters
+    stories = relationship("Story", back_populates="session")
+
+    @classmethod
+    async def read_current(cls, _id: UUID) -> "ConversationSession | None":
+        """Read a session, trusting a cached copy only once it is COMPLETED.
+
+        Completion is final, so a completed session's status and timestamps
+        can no longer go stale. Anything else is read from the database, once.
+        """
+        completed = cls.__read_cache__.peek(_id, lambda cached: cached.status == SessionStatus.COMPLETED)
+        if completed is not None:
+            return completed
+        return await cls.read(_id, cached=False)
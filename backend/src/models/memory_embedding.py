@@ -0,0 +1,20 @@
+from sqlalchemy import String, Text, Integer, ForeignKey, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+from database.models import CRUD
+
+
+class MemoryEmbedding(CRUD):
+    """One indexed passage: a story paragraph or a grandparent's chat turn."""
+
+    __tablename__ = "memory_embeddings"
+
+    memory_space_id: Mapped[UUID] = mapped_column(ForeignKey("memory_spaces.id", ondelete="CASCADE"), nullable=False)
+    session_id: Mapped[UUID] = mapped_column(ForeignKey("conversation_sessions.id", ondelete="CASCADE"), nullable=False)
+    source_type: Mapped[str] = mapped_column(String, nullable=False)  # "story" or "message"
+    source_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    chunk: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # Paragraph number within a story
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    embedder: Mapped[str] = mapped_column(String, nullable=False)
+    # float32 vector bytes (numpy ``tobytes``)
+    vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
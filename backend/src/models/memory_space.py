@@ -1,10 +1,17 @@
 from sqlalchemy import String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from config.settings import settings
+from database.cache import read_cache
 from database.models import CRUD
 
 
 class MemorySpace(CRUD):
     __tablename__ = "memory_spaces"
+    __read_cache__ = read_cache(
+        "memory_spaces",
+        settings.memory_space_cache_size,
+        settings.memory_space_cache_ttl_seconds,
+    )
 
     grandparent_name: Mapped[str] = mapped_column(String, nullable=False)
     grandparent_photo_url: Mapped[str] = mapped_column(String, nullable=True)
@@ -1,15 +1,23 @@
 import enum
 from datetime import datetime
-from sqlalchemy import String, Text, Enum, DateTime, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import String, Text, Enum, DateTime, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from database.models import CRUD
+from libs.utils import story_content_fields
 
 
 class StoryStatus(str, enum.Enum):
+    PENDING = "pending"
+    GENERATING = "generating"
     GENERATED = "generated"
     EDITED = "edited"
     PUBLISHED = "published"
+    FAILED = "failed"
+
+
+# Statuses whose title/content are complete and can be listed
+READY_STATUSES = (StoryStatus.GENERATED, StoryStatus.EDITED, StoryStatus.PUBLISHED)
 
 
 class Story(CRUD):
@@ -19,11 +27,28 @@ class Story(CRUD):
     session_id: Mapped[UUID] = mapped_column(ForeignKey("conversation_sessions.id"), nullable=False)
     title: Mapped[str] = mapped_column(String, nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
+    # Derived from content on write so listings never read the full text
+    excerpt: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    word_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     topic: Mapped[str] = mapped_column(String, nullable=False)
     style: Mapped[str] = mapped_column(String, default="narrative")
     status: Mapped[StoryStatus] = mapped_column(Enum(StoryStatus), default=StoryStatus.GENERATED)
     generated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Background generation job bookkeeping
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    claimed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    error: Mapped[str] = mapped_column(Text, nullable=True)
+    # Full-text search vector (title weighted above content), maintained by a trigger
+    search_vector: Mapped[str] = mapped_column(TSVECTOR, nullable=True, deferred=True)
 
     memory_space = relationship("MemorySpace", back_populates="stories")
-    session = relationship("ConversationSession", back_populates="story")
+    session = relationship("ConversationSession", back_populates="stories")
+
+    @validates("content")
+    def _sync_content_fields(self, key, content):
+        """Keep excerpt and word_count in step with ORM edits of content."""
+        fields = story_content_fields(content or "")
+        self.excerpt = fields["excerpt"]
+        self.word_count = fields["word_count"]
+        return content
@@ -1,12 +1,18 @@
 import importlib
 import inspect
+import json
+import logging
 import os
-from typing import Any, Dict, Type
+import resource
+import time
+from typing import Any, Dict, Optional, Type
 
 from fastapi import APIRouter, FastAPI, WebSocket
 
 from .acquire import Acquire
 
+logger = logging.getLogger(__name__)
+
 
 class Manager:
     def __init__(self, app: FastAPI, prefix: str = "/api"):
@@ -15,40 +21,86 @@ class Manager:
         self.acquire = Acquire()
         self.services_dir = os.path.join(os.path.dirname(__file__), "..")
         self.mws_dir = os.path.join(os.path.dirname(__file__), "..", "..", "middleware")
+        # Optional; written by `python app.py --write-route-manifest`
+        self.manifest_path = os.path.normpath(os.path.join(self.services_dir, "routes.json"))
         self.ws_routes: Dict[str, Type] = {}
+        self.manifest: list[dict] = []
+        self.started = time.perf_counter()
+        self.startup_report: Dict[str, Any] = {"services_ms": {}}
 
     def register_services(self) -> None:
         if not os.path.exists(self.services_dir):
             return
-        self._register_services_recursive(self.services_dir, [])
-
-    def _register_services_recursive(self, current_dir: str, path_segments: list[str]) -> None:
-        for item in os.listdir(current_dir):
+        begin = time.perf_counter()
+        discovered = self._discover_services(self.services_dir, [])
+        entries = self._load_manifest(discovered)
+        if entries is None:
+            entries = [{"path": path_segments} for path_segments in discovered]
+            self.startup_report["route_manifest"] = "discovered"
+        else:
+            self.startup_report["route_manifest"] = "manifest"
+
+        for entry in entries:
+            self._register_service_from_path(entry["path"], entry.get("class"), entry.get("http_exposed"))
+        self.startup_report["register_services_ms"] = round((time.perf_counter() - begin) * 1000, 1)
+
+    def _discover_services(self, current_dir: str, path_segments: list[str]) -> list[list[str]]:
+        found = []
+        # Sorted so every worker registers routes in the same order
+        for item in sorted(os.listdir(current_dir)):
             if item.startswith("__"):
                 continue
 
             item_path = os.path.join(current_dir, item)
 
             if os.path.isdir(item_path):
-                self._register_services_recursive(item_path, path_segments + [item])
-            elif item == "service.py":
-                self._register_service_from_path(path_segments)
-
-    def _register_service_from_path(self, path_segments: list[str]) -> None:
-        if not path_segments:
-            return
-
+                found.extend(self._discover_services(item_path, path_segments + [item]))
+            elif item == "service.py" and path_segments:
+                found.append(path_segments)
+        return found
+
+    def _load_manifest(self, discovered: list[list[str]]) -> Optional[list[dict]]:
+        """Return the route manifest entries, or None if it is missing or stale."""
+        if not os.path.exists(self.manifest_path):
+            return None
+        with open(self.manifest_path) as f:
+            entries = json.load(f)["services"]
+
+        if [entry["path"] for entry in entries] != discovered:
+            logger.warning("Route manifest does not match services on disk; discovering routes instead")
+            return None
+        return entries
+
+    def write_manifest(self) -> str:
+        """Write the routes registered by this manager to ``routes.json``."""
+        with open(self.manifest_path, "w") as f:
+            json.dump({"services": self.manifest}, f, indent=2)
+            f.write("\n")
+        return self.manifest_path
+
+    def _register_service_from_path(
+        self,
+        path_segments: list[str],
+        class_name: Optional[str] = None,
+        expected_routes: Optional[list[str]] = None,
+    ) -> None:
         module_path = "services." + ".".join(path_segments) + ".service"
         api_path = f"{self.prefix}/" + "/".join(path_segments)
 
-        print(f"[DEBUG] Attempting to register: {module_path} at {api_path}")
+        begin = time.perf_counter()
         try:
             service_module = importlib.import_module(module_path)
-            print(f"[DEBUG] Successfully imported: {module_path}")
-            service_class = next(
-                (cls for name, cls in inspect.getmembers(service_module, inspect.isclass) if name.endswith("Service")),
-                None
-            )
+            if class_name:
+                service_class = getattr(service_module, class_name, None)
+            else:
+                service_class = next(
+                    (cls for name, cls in inspect.getmembers(service_module, inspect.isclass) if name.endswith("Service")),
+                    None
+                )
+
+            if service_class and expected_routes is not None:
+                if list(getattr(service_class, "http_exposed", [])) != expected_routes:
+                    logger.warning(f"Route manifest is stale for {module_path}; regenerate it")
 
             if service_class:
                 init_params = inspect.signature(service_class.__init__).parameters
@@ -56,6 +108,7 @@ class Manager:
                     service_instance = service_class(acquire=self.acquire)
                 else:
                     service_instance = service_class()
+                self.acquire.services[".".join(path_segments)] = service_instance
 
                 tag_name = path_segments[-1].replace("_", " ").title()
                 tag_description = None
@@ -79,45 +132,88 @@ class Manager:
                         router.add_api_route(path="", endpoint=endpoint, methods=[method.upper()])
 
                 if hasattr(service_instance, "http_exposed"):
+                    self.register_ws_routes(router, service_instance, path_segments[-1])
                     for route in service_instance.http_exposed:
-                        self.register_ws_routes(router, service_instance, path_segments[-1])
                         http_method, sub_path = route.split("=")
+                        if http_method == "ws":
+                            continue
                         endpoint_name = f"{http_method}_{sub_path}"
                         if hasattr(service_instance, endpoint_name):
                             endpoint = getattr(service_instance, endpoint_name)
                             router.add_api_route(path=f"/{sub_path}", endpoint=endpoint, methods=[http_method.upper()])
-                            print(f"[DEBUG] Registered route: {http_method.upper()} {api_path}/{sub_path}")
+                            logger.debug(f"Registered route: {http_method.upper()} {api_path}/{sub_path}")
 
                 if router:
                     self.app.include_router(router)
-                    print(f"[DEBUG] Router included for {api_path}")
+
+                self.manifest.append({
+                    "path": path_segments,
+                    "class": service_class.__name__,
+                    "http_exposed": list(getattr(service_class, "http_exposed", [])),
+                })
         except ModuleNotFoundError as e:
-            print(f"[DEBUG] ModuleNotFoundError for {module_path}: {e}")
+            logger.error(f"ModuleNotFoundError for {module_path}: {e}")
         except Exception as e:
-            print(f"[DEBUG] Error registering {module_path}: {e}")
+            logger.exception(f"Error registering {module_path}: {e}")
+        self.startup_report["services_ms"][".".join(path_segments)] = round((time.perf_counter() - begin) * 1000, 1)
+
+    async def startup(self) -> None:
+        """Run the optional ``startup`` hook of every registered service."""
+        begin = time.perf_counter()
+        for service_instance in self.acquire.services.values():
+            if hasattr(service_instance, "startup"):
+                await service_instance.startup()
+
+        now = time.perf_counter()
+        self.startup_report.update(
+            startup_hooks_ms=round((now - begin) * 1000, 1),
+            total_ms=round((now - self.started) * 1000, 1),
+            routes=len(self.app.routes),
+            # ru_maxrss is in KiB on Linux
+            max_rss_mb=round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        )
+        logger.info(f"Startup report (pid {os.getpid()}): {self.startup_report}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Collect the optional ``stats`` hook of every registered service, by service path."""
+        return {
+            name: service_instance.stats()
+            for name, service_instance in self.acquire.services.items()
+            if hasattr(service_instance, "stats")
+        }
+
+    async def shutdown(self) -> None:
+        """Run the optional ``shutdown`` hook of every registered service."""
+        for service_instance in self.acquire.services.values():
+            if hasattr(service_instance, "shutdown"):
+                await service_instance.shutdown()
 
     def register_middlewares(self) -> None:
+        """Add the ``Middleware`` class of every module in ``src/middleware``.
+
+        Modules are added in name order, so the last one is outermost. Import
+        errors propagate: a broken middleware should fail startup, not vanish.
+        """
         if not os.path.exists(self.mws_dir):
             return
-            
-        for mw_name in os.listdir(self.mws_dir):
+
+        begin = time.perf_counter()
+        for mw_name in sorted(os.listdir(self.mws_dir)):
             if mw_name.startswith("__") or not mw_name.endswith(".py"):
                 continue
-                
+
             mw_module_name = mw_name[:-3]
-            mw_module_path = f"src.middleware.{mw_module_name}"
-            
-            try:
-                mw_module = importlib.import_module(mw_module_path)
-                mw_class = getattr(mw_module, "Middleware", None)
-                if mw_class:
-                    init_params = inspect.signature(mw_class.__init__).parameters
-                    if "acquire" in init_params:
-                        self.app.add_middleware(mw_class, acquire=self.acquire)
-                    else:
-                        self.app.add_middleware(mw_class)
-            except ModuleNotFoundError:
-                pass
+            mw_module_path = f"middleware.{mw_module_name}"
+
+            mw_module = importlib.import_module(mw_module_path)
+            mw_class = getattr(mw_module, "Middleware", None)
+            if mw_class:
+                init_params = inspect.signature(mw_class.__init__).parameters
+                if "acquire" in init_params:
+                    self.app.add_middleware(mw_class, acquire=self.acquire)
+                else:
+                    self.app.add_middleware(mw_class)
+        self.startup_report["register_middlewares_ms"] = round((time.perf_counter() - begin) * 1000, 1)
 
     def register_ws_routes(self, router: APIRouter, service_instance: Any, service_name: str) -> None:
         for route in service_instance.http_exposed:
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+from uuid import UUID
+
+from sqlalchemy import select, update
+
+from config.settings import settings
+from database.postgres import async_session
+from libs.conversation_agent.agent import ConversationAgentFactory
+from libs.utils import format_transcript
+from models import ConversationMessage, ConversationSession
+
+logger = logging.getLogger(__name__)
+
+
+class ConversationContextManager:
+    """Keeps chat context bounded: recent turns verbatim, older turns summarized.
+
+    The agent only sees the last ``chat_history_turns`` runs from Agno's
+    history. Messages that fall out of that window are folded into
+    ``ConversationSession.summary`` by a background task after the turn,
+    so the request path never waits on summarization. Turns are folded in
+    batches of ``chat_summary_batch_turns``, so a long session makes one
+    summarize call per batch rather than one per turn. A batch is folded
+    just before its first turn would leave the window, so its newest turns
+    are briefly both summarized and verbatim, but no turn is ever in neither.
+    """
+
+    def __init__(self, agent_factory: ConversationAgentFactory):
+        self.agent_factory = agent_factory
+        self.window_turns = settings.chat_history_turns
+        self.token_budget = settings.chat_summary_token_budget
+        self.batch_turns = min(max(settings.chat_summary_batch_turns, 1), max(self.window_turns - 1, 1))
+        self._refreshing: dict[UUID, asyncio.Task] = {}
+
+    def schedule_refresh(self, session_id: UUID, message_count: int, summary_through: int) -> None:
+        """Refresh the session summary in the background once a batch of turns left the window.
+
+        Args:
+            session_id: Conversation session ID
+            message_count: Number of messages now stored for the session
+            summary_through: Last sequence number already in the summary
+        """
+        if self._fold_through(message_count, summary_through) is None or session_id in self._refreshing:
+            return
+
+        task = asyncio.create_task(self._refresh(session_id))
+        self._refreshing[session_id] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(session_id, None))
+
+    def _fold_through(self, message_count: int, summary_through: int) -> int | None:
+        """Last sequence number to fold into the summary now, or None if no fold is due."""
+        # Each turn is a user + assistant message pair; fold when the next
+        # turn would push an unsummarized turn out of the window
+        if message_count + 2 - 2 * self.window_turns <= summary_through:
+            return None
+        fold_through = message_count - 2 * (self.window_turns - self.batch_turns)
+        return fold_through if fold_through > summary_through else None
+
+    async def _refresh(self, session_id: UUID) -> None:
+        try:
+            async with async_session() as session:
+                conversation_session = await session.get(ConversationSession, session_id)
+                if not conversation_session:
+                    return
+                summary = conversation_session.summary
+                summary_through = conversation_session.summary_through or 0
+
+                last_query = select(ConversationMessage.sequence_number).where(
+                    ConversationMessage.session_id == session_id
+                ).order_by(ConversationMessage.sequence_number.desc()).limit(1)
+                last_sequence = (await session.execute(last_query)).scalar() or 0
+                fold_through = self._fold_through(last_sequence, summary_through)
+                if fold_through is None:
+                    return
+
+                messages_query = (
+                    select(ConversationMessage.role, ConversationMessage.content)
+                    .where(
+                        ConversationMessage.session_id == session_id,
+                        ConversationMessage.sequence_number > summary_through,
+                        ConversationMessage.sequence_number <= fold_through,
+                    )
+                    .order_by(ConversationMessage.sequence_number)
+                )
+                messages = (await session.execute(messages_query)).all()
+
+            # The LLM call runs without a DB connection checked out
+            new_summary = await self.agent_factory.summarize(
+                summary, format_transcript(messages), self.token_budget
+            )
+            # Hard cap at roughly 4 characters per token
+            new_summary = new_summary.strip()[: self.token_budget * 4]
+
+            async with async_session() as session:
+                await session.execute(
+                    update(ConversationSession)
+                    .where(
+                        ConversationSession.id == session_id,
+                        ConversationSession.summary_through == summary_through,
+                    )
+                    .values(summary=new_summary, summary_through=fold_through)
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+            ConversationSession.invalidate(session_id)
+        except Exception as e:
+            logger.error(f"Failed to refresh summary for session {session_id}: {e}")
+
+    async def shutdown(self) -> None:
+        """Wait for in-flight summary refreshes to finish."""
+        if self._refreshing:
+            await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
@@ -43,3 +43,20 @@ class ConversationHistoryResponse(BaseModel):
     started_at: str
     completed_at: Optional[str]
     messages: List[MessageDetail]
+
+
+class TranscriptSearchHit(BaseModel):
+    """Conversation message matching a search, with highlighted snippet."""
+    session_id: UUID
+    topic: str
+    role: str
+    sequence_number: int
+    snippet: str  # HTML-escaped text, matched words wrapped in <mark>
+    rank: float
+    created_at: str
+
+
+class TranscriptSearchResponse(BaseModel):
+    """Response with a page of transcript matches, best match first."""
+    results: List[TranscriptSearchHit]
+    next_cursor: Optional[str] = None  # None on the last page
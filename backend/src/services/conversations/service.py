@@ -1,29 +1,38 @@
-from datetime import datetime, timezone
+import logging
+from typing import Optional
 from uuid import UUID
-import json
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config.settings import settings
+from database import search
 from database.postgres import get_db
 from libs.conversation_agent.agent import ConversationAgentFactory
+from libs.metrics import ChatStreamTimer, track_stream
+from libs.sse import coalesce, sse_event, token_event
+from libs.tracing import span
+from libs.utils import encode_rank_cursor
 from models import (
     ConversationSession,
     ConversationMessage,
     MemorySpace,
-    TopicEnum,
-    SessionStatus,
 )
-from models.conversation_message import MessageRole
 from services.__base.acquire import Acquire
+from services.conversations.context import ConversationContextManager
 from services.conversations.schema import (
     ConversationStartRequest,
     ConversationRespondResponse,
     ConversationHistoryResponse,
     MessageDetail,
+    TranscriptSearchHit,
+    TranscriptSearchResponse,
 )
+from services.conversations.turns import start_turn, finish_turn
+
+logger = logging.getLogger(__name__)
 
 
 class ConversationsService:
@@ -32,88 +41,87 @@ class ConversationsService:
     http_exposed = [
         "post=chat",
         "get=get_history",
+        "get=search",
     ]
 
     def __init__(self, acquire: Acquire):
         """Initialize service."""
         self.acquire = acquire
         self.agent_factory = ConversationAgentFactory()
+        self.context_manager = ConversationContextManager(self.agent_factory)
+
+    async def startup(self) -> None:
+        """Warm Agno's storage pool and the model client before traffic arrives."""
+        try:
+            await self.agent_factory.warmup(settings.warmup_db_connections, settings.warmup_llm)
+        except Exception as e:
+            logger.warning(f"Conversation agent warmup failed: {e}")
+
+    def stats(self) -> dict:
+        """Agent pool counters for ``/health`` (per worker)."""
+        return {"agent_pool": self.agent_factory.pool_stats()}
+
+    async def shutdown(self) -> None:
+        """Let background summary refreshes finish, then close Agno's storage pool."""
+        await self.context_manager.shutdown()
+        self.agent_factory.close()
 
     async def post_chat(
         self,
         request: ConversationStartRequest,
-        session: AsyncSession = Depends(get_db),
     ) -> StreamingResponse:
         """Chat with the AI agent. Creates session on first call, continues on subsequent calls.
         
+        Database connections are only checked out for the short persistence
+        steps before and after the LLM call, never while tokens stream.
+        
         Args:
             request: Chat request with memory_space_id, topic, and optional session_id
-            session: Database session
             
         Returns:
             Streaming response with AI tokens
         """
-        # Check if session exists
-        conversation_session = None
-        if hasattr(request, 'session_id') and request.session_id:
-            query = select(ConversationSession).where(ConversationSession.id == request.session_id)
-            result = await session.execute(query)
-            conversation_session = result.scalar_one_or_none()
+        # Prepare user message
+        user_msg = request.user_message if request.user_message else "Start the conversation with a warm greeting and your first question."
 
-        # Create new session if doesn't exist
-        if not conversation_session:
-            # Verify memory space exists
-            query = select(MemorySpace).where(MemorySpace.id == request.memory_space_id)
-            result = await session.execute(query)
-            memory_space = result.scalar_one_or_none()
-
-            if not memory_space:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Memory space not found",
-                )
+        # Memory spaces rarely change, so this is normally served from the read cache
+        with span("memory_space"):
+            memory_space = await MemorySpace.read(request.memory_space_id)
+        if not memory_space:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Memory space not found",
+            )
 
-            # Create conversation session with default topic
-            conversation_session = ConversationSession(
+        # One statement: load/create the session, allocate sequence numbers,
+        # bump counters and store the user message
+        with span("start_turn"):
+            turn = await start_turn(
                 memory_space_id=request.memory_space_id,
-                topic=TopicEnum.CHILDHOOD,  # Default topic
-                status=SessionStatus.IN_PROGRESS,
-                input_mode="text",  # Default to text
-                started_at=datetime.now(timezone.utc),
-                question_count=0,
+                session_id=getattr(request, 'session_id', None),
+                user_message=user_msg,
+                end_conversation=bool(request.end_conversation),
             )
-            session.add(conversation_session)
-            await session.flush()
-        else:
-            # Get memory space
-            query = select(MemorySpace).where(MemorySpace.id == conversation_session.memory_space_id)
-            result = await session.execute(query)
-            memory_space = result.scalar_one_or_none()
+        if turn.memory_space_id != memory_space.id:
+            memory_space = await MemorySpace.read(turn.memory_space_id)
 
         # Use provided grandparent name or get from memory space
         grandparent_name = request.grandparent_name if request.grandparent_name else memory_space.grandparent_name
-        
-        # Increment question count
-        conversation_session.question_count += 1
-        
+
+        session_id = turn.id
+        question_count = turn.question_count
+        summary = turn.summary
+        summary_through = turn.summary_through or 0
+        assistant_sequence = turn.message_count
+
         # Check if user explicitly wants to end conversation
-        is_complete = False
-        should_ask_to_continue = False
+        is_complete = bool(request.end_conversation)
+        # Every 10 questions, flag to ask if they want to continue
+        should_ask_to_continue = not is_complete and question_count % 10 == 0
         
+        # If ending conversation, add a closing message
         if request.end_conversation:
-            # User explicitly ended the conversation
-            conversation_session.status = SessionStatus.COMPLETED
-            conversation_session.completed_at = datetime.now(timezone.utc)
-            is_complete = True
-        elif conversation_session.question_count > 0 and conversation_session.question_count % 10 == 0:
-            # Every 10 questions, flag to ask if they want to continue
-            should_ask_to_continue = True
-
-        await session.commit()
-        
-        # Stream AI response
-        session_id = conversation_session.id
-        question_count = conversation_session.question_count
+            user_msg = f"{user_msg}\n\nPlease provide a warm closing message thanking {grandparent_name} for sharing their memories."
         
         async def generate():
             try:
@@ -125,78 +133,47 @@ class ConversationsService:
                     "is_complete": is_complete,
                     "should_ask_to_continue": should_ask_to_continue,
                 }
-                yield f"data: {json.dumps(metadata)}\n\n"
-                
-                # Prepare user message
-                user_msg = request.user_message if request.user_message else "Start the conversation with a warm greeting and your first question."
-                
-                # Get current message count for sequence numbers
-                count_query = select(func.count(ConversationMessage.id)).where(
-                    ConversationMessage.session_id == session_id
-                )
-                count_result = await session.execute(count_query)
-                current_message_count = count_result.scalar() or 0
-                
-                # Save user message to database
-                user_message = ConversationMessage(
-                    session_id=session_id,
-                    role=MessageRole.USER.value,  # Use .value to get string
-                    content=user_msg,
-                    sequence_number=current_message_count + 1,
-                )
-                session.add(user_message)
-                await session.commit()
-                
-                # If ending conversation, add a closing message
-                if request.end_conversation:
-                    user_msg = f"{user_msg}\n\nPlease provide a warm closing message thanking {grandparent_name} for sharing their memories."
+                yield sse_event(metadata)
                 
                 # Collect AI response while streaming
                 ai_response_parts = []
+
+                async def reply_tokens():
+                    timer = ChatStreamTimer()
+                    async for token in self.agent_factory.chat(
+                        chat_session_id=session_id,
+                        grandparent_name=grandparent_name,
+                        message=user_msg,
+                        summary=summary,
+                    ):
+                        if token.content:
+                            timer.token(token.content)
+                            ai_response_parts.append(token.content)
+                            yield token.content
+                    timer.finish()
+
+                # Batch tiny chunks into fewer frames
+                async for text in coalesce(reply_tokens(), settings.sse_coalesce_ms / 1000, settings.sse_coalesce_max_chars):
+                    yield token_event(text)
                 
-                async for token in self.agent_factory.chat(
-                    chat_session_id=session_id,
-                    grandparent_name=grandparent_name,
-                    message=user_msg,
-                ):
-                    # Extract content from token event
-                    if hasattr(token, 'content') and token.content:
-                        content = token.content
-                        
-                        # Filter out tool execution messages (e.g., "get_chat_history(...) completed in X.XXs")
-                        if "completed in" in content and "get_chat_history" in content:
-                            continue  # Skip tool messages
-                        
-                        ai_response_parts.append(content)
-                        token_data = {
-                            "type": "token",
-                            "content": content,
-                        }
-                        yield f"data: {json.dumps(token_data)}\n\n"
-                
-                # Save AI response to database
                 ai_response = "".join(ai_response_parts)
-                assistant_message = ConversationMessage(
-                    session_id=session_id,
-                    role=MessageRole.ASSISTANT.value,  # Use .value to get string
-                    content=ai_response,
-                    sequence_number=current_message_count + 2,
-                )
-                session.add(assistant_message)
                 
                 # If should ask to continue, add a continuation prompt
                 if should_ask_to_continue and not is_complete:
                     continuation_text = "\n\nWe've covered quite a bit! Would you like to continue sharing more memories, or shall we catch up another time?"
                     # Append to AI response in database
-                    assistant_message.content += continuation_text
+                    ai_response += continuation_text
                     
-                    continue_prompt = {
-                        "type": "token",
-                        "content": continuation_text,
-                    }
-                    yield f"data: {json.dumps(continue_prompt)}\n\n"
+                    yield token_event(continuation_text)
                 
-                await session.commit()
+                # Save AI response to database on a fresh, short-lived connection
+                with span("finish_turn"):
+                    await finish_turn(session_id, assistant_sequence, ai_response)
+
+                # Fold turns that left the history window into the summary (off the request path)
+                self.context_manager.schedule_refresh(
+                    session_id, assistant_sequence, summary_through
+                )
                 
                 # Send completion marker
                 completion = {
@@ -206,7 +183,7 @@ class ConversationsService:
                     "is_complete": is_complete,
                     "should_ask_to_continue": should_ask_to_continue,
                 }
-                yield f"data: {json.dumps(completion)}\n\n"
+                yield sse_event(completion)
                 
             except Exception as e:
                 # Send error event
@@ -214,10 +191,10 @@ class ConversationsService:
                     "type": "error",
                     "message": str(e),
                 }
-                yield f"data: {json.dumps(error_data)}\n\n"
+                yield sse_event(error_data)
         
         return StreamingResponse(
-            generate(),
+            track_stream("chat", generate()),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
@@ -239,10 +216,8 @@ class ConversationsService:
         Returns:
             ConversationHistoryResponse with all messages
         """
-        # Get conversation session
-        query = select(ConversationSession).where(ConversationSession.id == session_id)
-        result = await session.execute(query)
-        conversation_session = result.scalar_one_or_none()
+        # Get conversation session (cached once completed)
+        conversation_session = await ConversationSession.read_current(session_id)
 
         if not conversation_session:
             raise HTTPException(
@@ -275,3 +250,83 @@ class ConversationsService:
                 for msg in messages
             ],
         )
+
+    async def get_search(
+        self,
+        space_id: UUID,
+        q: str = Query(..., min_length=1, max_length=200),
+        limit: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = None,
+        session: AsyncSession = Depends(get_db),
+    ) -> TranscriptSearchResponse:
+        """Search the messages of a memory space's conversations, best match first.
+        
+        Args:
+            space_id: Memory space ID
+            q: Search text; supports "quoted phrases", OR and -excluded words
+            limit: Maximum number of results to return
+            cursor: next_cursor from the previous page
+            session: Database session
+            
+        Returns:
+            TranscriptSearchResponse with ranked, highlighted messages
+        """
+        tsquery = search.parse_query(q)
+        rank = search.rank(ConversationMessage.search_vector, tsquery)
+        page = (
+            select(ConversationMessage.id, rank.label("rank"))
+            .join(ConversationSession, ConversationMessage.session_id == ConversationSession.id)
+            .where(
+                ConversationSession.memory_space_id == space_id,
+                search.matches(ConversationMessage.search_vector, tsquery),
+            )
+        )
+        if cursor:
+            try:
+                page = page.where(search.after_cursor(rank, ConversationMessage.id, cursor))
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor",
+                )
+        # Fetch one extra row to know whether another page exists
+        page = page.order_by(rank.desc(), ConversationMessage.id.desc()).limit(limit + 1).subquery()
+
+        # Snippets are only built for the rows of this page
+        query = (
+            select(
+                ConversationMessage.id,
+                ConversationMessage.session_id,
+                ConversationSession.topic,
+                ConversationMessage.role,
+                ConversationMessage.sequence_number,
+                ConversationMessage.created_at,
+                page.c.rank,
+                search.headline(ConversationMessage.content, tsquery).label("snippet"),
+            )
+            .join(page, page.c.id == ConversationMessage.id)
+            .join(ConversationSession, ConversationMessage.session_id == ConversationSession.id)
+            .order_by(page.c.rank.desc(), ConversationMessage.id.desc())
+        )
+        rows = (await session.execute(query)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].id)
+
+        return TranscriptSearchResponse(
+            results=[
+                TranscriptSearchHit(
+                    session_id=row.session_id,
+                    topic=row.topic.value,
+                    role=row.role,
+                    sequence_number=row.sequence_number,
+                    snippet=search.render_headline(row.snippet),
+                    rank=row.rank,
+                    created_at=row.created_at.isoformat(),
+                )
+                for row in rows
+            ],
+            next_cursor=next_cursor,
+        )
@@ -0,0 +1,147 @@
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import Row, insert, literal, select, update
+
+from database.postgres import async_session
+from models import (
+    ConversationSession,
+    ConversationMessage,
+    TopicEnum,
+    SessionStatus,
+)
+from models.conversation_message import MessageRole
+
+# Columns handed back to post_chat for a turn
+TURN_COLUMNS = (
+    ConversationSession.id,
+    ConversationSession.memory_space_id,
+    ConversationSession.question_count,
+    ConversationSession.message_count,
+    ConversationSession.summary,
+    ConversationSession.summary_through,
+)
+
+
+async def start_turn(
+    memory_space_id: UUID,
+    session_id: UUID | None,
+    user_message: str,
+    end_conversation: bool,
+) -> Row:
+    """Begin a chat turn in a single statement.
+
+    Loads (or creates) the conversation session, allocates both message
+    sequence numbers, bumps the question count and stores the user message.
+    The memory space is not touched here; callers look it up through
+    ``MemorySpace.read``, which is cached.
+
+    Args:
+        memory_space_id: Memory space the conversation belongs to
+        session_id: Existing conversation session ID, if any
+        user_message: The grandparent's message for this turn
+        end_conversation: Whether this turn completes the conversation
+
+    Returns:
+        Row with the session columns
+    """
+    now = datetime.now(timezone.utc)
+    async with async_session() as session:
+        row = None
+        if session_id:
+            values = dict(
+                message_count=ConversationSession.message_count + 2,
+                question_count=ConversationSession.question_count + 1,
+            )
+            if end_conversation:
+                values.update(status=SessionStatus.COMPLETED, completed_at=now)
+            turn_session = (
+                update(ConversationSession)
+                .where(ConversationSession.id == session_id)
+                .values(**values)
+                .returning(*TURN_COLUMNS)
+                .cte("turn_session")
+            )
+            row = await _finish_start(session, turn_session, user_message)
+
+        if row is None:
+            status_value = SessionStatus.COMPLETED if end_conversation else SessionStatus.IN_PROGRESS
+            turn_session = (
+                insert(ConversationSession)
+                .from_select(
+                    [
+                        "memory_space_id",
+                        "topic",
+                        "status",
+                        "input_mode",
+                        "started_at",
+                        "completed_at",
+                        "question_count",
+                        "message_count",
+                        "summary_through",
+                    ],
+                    select(
+                        literal(memory_space_id, ConversationSession.memory_space_id.type),
+                        literal(TopicEnum.CHILDHOOD, ConversationSession.topic.type),  # Default topic
+                        literal(status_value, ConversationSession.status.type),
+                        literal("text"),  # Default to text
+                        literal(now, ConversationSession.started_at.type),
+                        literal(now if end_conversation else None, ConversationSession.completed_at.type),
+                        literal(1),
+                        literal(2),
+                        literal(0),
+                    ),
+                    include_defaults=False,
+                )
+                .returning(*TURN_COLUMNS)
+                .cte("turn_session")
+            )
+            row = await _finish_start(session, turn_session, user_message)
+
+        await session.commit()
+
+    # Counters (and possibly status) changed
+    ConversationSession.invalidate(row.id)
+    return row
+
+
+async def _finish_start(session, turn_session, user_message: str) -> Row | None:
+    """Insert the user message alongside ``turn_session`` and return the session row."""
+    user_insert = (
+        insert(ConversationMessage)
+        .from_select(
+            ["session_id", "role", "content", "sequence_number"],
+            select(
+                turn_session.c.id,
+                literal(MessageRole.USER.value),
+                literal(user_message),
+                turn_session.c.message_count - 1,
+            ),
+            include_defaults=False,
+        )
+        .returning(ConversationMessage.id)
+        .cte("user_message")
+    )
+    query = select(turn_session).where(select(user_insert.c.id).exists())
+    result = await session.execute(query)
+    return result.first()
+
+
+async def finish_turn(session_id: UUID, sequence_number: int, ai_response: str) -> None:
+    """Store the assistant's reply for a turn started with ``start_turn``.
+
+    Args:
+        session_id: Conversation session ID
+        sequence_number: Sequence number allocated by ``start_turn``
+        ai_response: Full assistant response
+    """
+    async with async_session() as session:
+        await session.execute(
+            insert(ConversationMessage).values(
+                session_id=session_id,
+                role=MessageRole.ASSISTANT.value,
+                content=ai_response,
+                sequence_number=sequence_number,
+            )
+        )
+        await session.commit()
@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+from typing import AsyncIterator
+
+from sqlalchemy import select
+
+from config.settings import settings
+from database.postgres import async_session
+from libs.export import GRANDCHILD, EpubFormat, MarkdownFormat, ZipStream, slugify
+from models import ConversationMessage, ConversationSession, MemorySpace, MessageRole, Story
+from models.story import READY_STATUSES
+
+
+async def export_archive(
+    memory_space: MemorySpace,
+    fmt: MarkdownFormat,
+    transcripts: bool = True,
+) -> AsyncIterator[bytes]:
+    """Stream a memory space's stories (and transcripts) as a ZIP or EPUB archive.
+
+    Rows come from server-side cursors (``yield_per``) and each file is
+    compressed as soon as its rows arrive, so memory use doesn't grow with
+    the archive; only file names are kept, for the index written last.
+
+    Args:
+        memory_space: Memory space to export
+        fmt: Output format from ``libs.export.FORMATS``
+        transcripts: Also export one file per conversation
+
+    Yields:
+        Archive bytes, in chunks of roughly ``settings.export_chunk_bytes``
+    """
+    archive = ZipStream()
+    if isinstance(fmt, EpubFormat):
+        fmt.start(archive)
+    title = f"{memory_space.grandparent_name}'s memories"
+    entries: list[tuple[str, str]] = []
+
+    async with async_session() as session:
+        stories = await session.stream(
+            select(Story.title, Story.content, Story.topic, Story.generated_at)
+            .where(Story.memory_space_id == memory_space.id, Story.status.in_(READY_STATUSES))
+            .order_by(Story.generated_at, Story.id)
+            .execution_options(yield_per=settings.export_yield_per)
+        )
+        async for story in stories:
+            path = f"stories/{len(entries) + 1:04d}-{slugify(story.title)}.{fmt.extension}"
+            archive.write(path, fmt.story(story.title, story.content, story.topic, story.generated_at), story.generated_at)
+            entries.append((path, story.title))
+            if archive.pending >= settings.export_chunk_bytes:
+                yield archive.drain()
+
+        if transcripts:
+            messages = await session.stream(
+                select(
+                    ConversationSession.id,
+                    ConversationSession.topic,
+                    ConversationSession.started_at,
+                    ConversationMessage.role,
+                    ConversationMessage.content,
+                )
+                .join(ConversationMessage, ConversationMessage.session_id == ConversationSession.id)
+                .where(ConversationSession.memory_space_id == memory_space.id)
+                .order_by(ConversationSession.started_at, ConversationSession.id, ConversationMessage.sequence_number)
+                .execution_options(yield_per=settings.export_yield_per)
+            )
+            # Rows arrive grouped by conversation; each one is written as a single entry
+            current, entry = None, None
+            async for row in messages:
+                if row.id != current:
+                    if entry:
+                        entry.write(fmt.transcript_footer().encode())
+                        entry.close()
+                    current = row.id
+                    topic = row.topic.value.replace("_", " ").capitalize()
+                    name = f"{topic} conversation, {row.started_at:%B %-d, %Y}"
+                    path = (
+                        f"conversations/{len(entries) + 1:04d}-{row.started_at:%Y-%m-%d}-"
+                        f"{slugify(row.topic.value)}.{fmt.extension}"
+                    )
+                    entry = archive.open(path, row.started_at)
+                    entry.write(fmt.transcript_header(name).encode())
+                    entries.append((path, name))
+
+                speaker = memory_space.grandparent_name if row.role == MessageRole.USER.value else GRANDCHILD
+                entry.write(fmt.message(speaker, row.content).encode())
+                if archive.pending >= settings.export_chunk_bytes:
+                    yield archive.drain()
+            if entry:
+                entry.write(fmt.transcript_footer().encode())
+                entry.close()
+
+    if isinstance(fmt, EpubFormat):
+        archive.write("nav.xhtml", fmt.index(title, entries))
+        archive.write(
+            "content.opf",
+            fmt.package(str(memory_space.id), title, datetime.now(timezone.utc), [path for path, _ in entries]),
+        )
+    else:
+        archive.write(f"index.{fmt.extension}", fmt.index(title, entries))
+    yield archive.close()
@@ -1,12 +1,18 @@
+from typing import Literal
 from uuid import UUID, uuid4
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config.settings import settings
 from database.postgres import get_db
+from libs.export import FORMATS, slugify
+from libs.http_cache import cache_headers, is_not_modified, make_etag, not_modified_response
 from models import MemorySpace, FamilyMember
 from services.__base.acquire import Acquire
+from services.memory_spaces.export import export_archive
 from services.memory_spaces.schema import (
     MemorySpaceCreate,
     MemorySpaceCreateResponse,
@@ -20,6 +26,7 @@ class MemorySpacesService:
     http_exposed = [
         "post=create",
         "get=get_by_id",
+        "get=export",
     ]
 
     def __init__(self, acquire: Acquire):
@@ -81,20 +88,23 @@ class MemorySpacesService:
     async def get_get_by_id(
         self,
         space_id: UUID,
-        session: AsyncSession = Depends(get_db),
+        request: Request,
+        response: Response,
     ) -> MemorySpaceDetail:
         """Get memory space details by ID.
         
+        Memory spaces have no modification time, so the ETag is derived from
+        the fields in the response and If-None-Match is the only validator.
+        
         Args:
             space_id: Memory space ID
-            session: Database session
+            request: Incoming request (for If-None-Match)
+            response: Outgoing response (for caching headers)
             
         Returns:
             MemorySpaceDetail with space information
         """
-        query = select(MemorySpace).where(MemorySpace.id == space_id)
-        result = await session.execute(query)
-        memory_space = result.scalar_one_or_none()
+        memory_space = await MemorySpace.read(space_id)
 
         if not memory_space:
             raise HTTPException(
@@ -102,6 +112,22 @@ class MemorySpacesService:
                 detail="Memory space not found",
             )
 
+        headers = cache_headers(
+            make_etag(
+                memory_space.id,
+                memory_space.grandparent_name,
+                memory_space.grandparent_photo_url,
+                memory_space.relation,
+            ),
+            cache_control=(
+                f"public, max-age={settings.http_cache_max_age}, "
+                f"stale-while-revalidate={settings.http_cache_stale_while_revalidate}"
+            ),
+        )
+        if is_not_modified(request, headers["ETag"]):
+            return not_modified_response(headers)
+        response.headers.update(headers)
+
         return MemorySpaceDetail(
             id=memory_space.id,
             grandparent_name=memory_space.grandparent_name,
@@ -109,3 +135,42 @@ class MemorySpacesService:
             relation=memory_space.relation,
             created_at=memory_space.created_at.isoformat(),
         )
+
+    async def get_export(
+        self,
+        space_id: UUID,
+        export_format: Literal["markdown", "html", "epub"] = Query("markdown", alias="format"),
+        transcripts: bool = True,
+    ) -> StreamingResponse:
+        """Download all stories and conversation transcripts of a memory space.
+        
+        The archive is streamed while it is being built: a ZIP with one
+        Markdown or HTML file per story and per conversation, or a single
+        EPUB book.
+        
+        Args:
+            space_id: Memory space ID
+            export_format: "markdown" or "html" (ZIP archive), or "epub"
+            transcripts: Include conversation transcripts
+            
+        Returns:
+            Streaming response with the archive
+        """
+        memory_space = await MemorySpace.read(space_id)
+
+        if not memory_space:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Memory space not found",
+            )
+
+        fmt = FORMATS[export_format]()
+        filename = f"{slugify(memory_space.grandparent_name)}-memories.{fmt.archive_extension}"
+        return StreamingResponse(
+            export_archive(memory_space, fmt, transcripts),
+            media_type=fmt.media_type,
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "Cache-Control": "no-store",
+            },
+        )
@@ -2,6 +2,7 @@ from .service import StoriesService
 from .schema import (
     StoryGenerateRequest,
     StoryGenerateResponse,
+    StoryStatusResponse,
     StoryDetail,
     StoryListItem,
     StoriesListResponse,
@@ -13,6 +14,7 @@ __all__ = [
     "StoriesService",
     "StoryGenerateRequest",
     "StoryGenerateResponse",
+    "StoryStatusResponse",
     "StoryDetail",
     "StoryListItem",
     "StoriesListResponse",
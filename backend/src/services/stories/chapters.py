@@ -0,0 +1,127 @@
+import re
+
+from libs.embeddings import stem
+from models import MessageRole, TopicEnum
+
+# Stories written per topic of a conversation are stored with this style
+CHAPTER_STYLE = "chapter"
+
+# In the order the conversation agent walks through them
+TOPICS = list(TopicEnum)
+
+KEYWORDS = {
+    TopicEnum.CHILDHOOD: frozenset(
+        "child childhood kid young school teacher classmate grew grow growing parent mother father mom mum "
+        "dad brother sister sibling toy play played playing game neighborhood neighbour neighbor village "
+        "born boy girl little holiday birthday doll bicycle bike playground".split()
+    ),
+    TopicEnum.LOVE_STORY: frozenset(
+        "love loved met meet meeting dance danced dancing date dated dating married marry marriage wedding "
+        "husband wife grandmother grandfather grandma grandpa romance romantic kiss kissed propose proposed "
+        "proposal sweetheart boyfriend girlfriend courting courted honeymoon ring bride engaged partner".split()
+    ),
+    TopicEnum.CAREER: frozenset(
+        "work worked working job career boss company office factory business profession professional retire "
+        "retired retirement colleague coworker salary wage paid promotion promoted shift trade apprentice "
+        "apprenticeship employer hired earn earned customer shop manager university college degree training".split()
+    ),
+    TopicEnum.LIFE_LESSONS: frozenset(
+        "learn learned learnt lesson advice wisdom wise regret proud important matter believe value kindness "
+        "patience patient grateful gratitude mistake teach taught meaning younger self happiness future "
+        "hope forgive honest honesty".split()
+    ),
+    TopicEnum.SURPRISE: frozenset(
+        "surprise surprised surprising secret unexpected unexpectedly nobody shocked shock funny strange "
+        "strangest adventure crazy wild risk brave dare dared confess guess imagine".split()
+    ),
+}
+
+_WORD = re.compile(r"[a-z]+")
+
+# Interviewer questions announce topic changes, so their words count double
+QUESTION_WEIGHT = 2.0
+# Changing topic costs this much, so turns without keywords stay in the current chapter
+SWITCH_PENALTY = 0.5
+# Shorter chapters are merged into their neighbour
+MIN_CHAPTER_TURNS = 2
+
+
+def topic_label(topic: str) -> str:
+    """Readable topic name: "love_story" -> "Love story"."""
+    return topic.replace("_", " ").capitalize()
+
+
+def split_turns(messages) -> list[list]:
+    """Group messages into turns: an interviewer question and the answers that follow it."""
+    turns: list[list] = []
+    for msg in messages:
+        answered = turns and any(m.role == MessageRole.USER.value for m in turns[-1])
+        if not turns or (msg.role != MessageRole.USER.value and answered):
+            turns.append([])
+        turns[-1].append(msg)
+    return turns
+
+
+def score_turn(turn) -> list[float]:
+    """Keyword hits per topic, in ``TOPICS`` order."""
+    scores = [0.0] * len(TOPICS)
+    for msg in turn:
+        weight = 1.0 if msg.role == MessageRole.USER.value else QUESTION_WEIGHT
+        for word in _WORD.findall(msg.content.lower()):
+            word = stem(word)
+            for i, topic in enumerate(TOPICS):
+                if word in KEYWORDS[topic]:
+                    scores[i] += weight
+    return scores
+
+
+def segment_by_topic(messages) -> list[tuple[TopicEnum, list]]:
+    """Split a conversation into consecutive per-topic chapters.
+
+    Turns are scored against each topic's keywords, then labelled by
+    dynamic programming: labels may only move forward through ``TOPICS``
+    (the order the interview follows, skipping topics allowed) and every
+    change of topic costs ``SWITCH_PENALTY``. Chapters shorter than
+    ``MIN_CHAPTER_TURNS`` are folded into a neighbour.
+
+    Args:
+        messages: Conversation messages (role, content) in order
+
+    Returns:
+        List of (topic, messages) in conversation order
+    """
+    turns = split_turns(messages)
+    if not turns:
+        return []
+
+    # best[t]: score of the best labelling so far whose last turn is topic t
+    best = score_turn(turns[0])
+    back: list[list[int]] = []
+    for turn in turns[1:]:
+        scores = score_turn(turn)
+        came_from = []
+        for t in range(len(TOPICS)):
+            source = max(range(t + 1), key=lambda s: best[s] - (SWITCH_PENALTY if s != t else 0.0))
+            came_from.append(source)
+        best = [
+            best[came_from[t]] - (SWITCH_PENALTY if came_from[t] != t else 0.0) + scores[t]
+            for t in range(len(TOPICS))
+        ]
+        back.append(came_from)
+
+    labels = [max(range(len(TOPICS)), key=lambda t: best[t])]
+    for came_from in reversed(back):
+        labels.append(came_from[labels[-1]])
+    labels.reverse()
+
+    # A short chapter joins the next one, a short last chapter the one before it
+    chapters: list[tuple[int, list]] = []
+    for label, turn in zip(labels, turns):
+        if chapters and (chapters[-1][0] == label or len(chapters[-1][1]) < MIN_CHAPTER_TURNS):
+            chapters[-1] = (label, chapters[-1][1] + [turn])
+        else:
+            chapters.append((label, [turn]))
+    if len(chapters) > 1 and len(chapters[-1][1]) < MIN_CHAPTER_TURNS:
+        chapters[-2][1].extend(chapters.pop()[1])
+
+    return [(TOPICS[label], [msg for turn in chapter for msg in turn]) for label, chapter in chapters]
@@ -0,0 +1,291 @@
+import logging
+from dataclasses import dataclass
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import delete, func, insert, or_, select
+
+from config.settings import settings
+from database.cache import read_cache
+from database.postgres import async_session
+from libs.embeddings import Embedder, get_embedder, normalize
+from models import ConversationMessage, MemoryEmbedding, MessageRole, Story
+from models.story import READY_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# Shorter story paragraphs and chat turns ("Yes", "I don't remember") carry no topic
+MIN_PASSAGE_WORDS = 8
+
+
+def story_passages(content: str) -> list[str]:
+    """Split story text into paragraphs worth indexing (headings and short lines dropped)."""
+    paragraphs = (p.strip() for p in content.split("\n\n"))
+    return [p for p in paragraphs if not p.startswith("#") and len(p.split()) >= MIN_PASSAGE_WORDS]
+
+
+@dataclass
+class SpaceIndex:
+    """A memory space's passages as one matrix, ready for dot-product scoring."""
+
+    matrix: np.ndarray  # (passages, dim) float32, weighted and unit-length rows
+    weights: np.ndarray | None
+    is_story: np.ndarray  # bool per passage
+    source_codes: np.ndarray  # int32 per passage, index into sources
+    session_codes: np.ndarray  # int32 per passage, index into sessions
+    sources: list[UUID]
+    sessions: list[UUID]
+    texts: list[str]
+    version: tuple  # (passages, newest created_at) when loaded
+
+    def code(self, values: list[UUID], value: UUID) -> int:
+        try:
+            return values.index(value)
+        except ValueError:
+            return -1
+
+
+@dataclass
+class RelatedStoryHit:
+    story_id: UUID
+    score: float
+    passage: str
+
+
+@dataclass
+class RelatedMomentHit:
+    message_id: UUID
+    session_id: UUID
+    score: float
+    text: str
+
+
+class RelatedIndex:
+    """Per memory space vector index over story paragraphs and grandparent turns.
+
+    Vectors are stored in ``memory_embeddings`` as float32 bytes and written
+    when a story is generated, together with the user turns of its
+    conversation. Reads load a memory space's vectors into one NumPy matrix,
+    kept in a per-process read cache, and score a query with a single
+    matrix-vector product and ``argpartition`` top-k. Each read first checks
+    the space's passage count and newest ``created_at`` (an index-only
+    query), so a story indexed by another worker shows up right away.
+    """
+
+    def __init__(self, embedder: Embedder | None = None):
+        self.embedder = embedder or get_embedder()
+        self.cache = read_cache(
+            "related_index",
+            settings.related_index_cache_size,
+            settings.related_index_cache_ttl_seconds,
+        )
+
+    async def index_story(self, story_id: UUID) -> int:
+        """(Re)index a story's paragraphs and its conversation's user turns.
+
+        Args:
+            story_id: Story to index
+
+        Returns:
+            Number of passages stored
+        """
+        async with async_session() as session:
+            story = (await session.execute(
+                select(Story.memory_space_id, Story.session_id, Story.content).where(Story.id == story_id)
+            )).first()
+            if story is None:
+                return 0
+            messages = (await session.execute(
+                select(ConversationMessage.id, ConversationMessage.content)
+                .where(
+                    ConversationMessage.session_id == story.session_id,
+                    ConversationMessage.role == MessageRole.USER.value,
+                )
+                .order_by(ConversationMessage.sequence_number)
+            )).all()
+
+            passages = [("story", story_id, chunk, text) for chunk, text in enumerate(story_passages(story.content))]
+            passages += [
+                ("message", message.id, 0, message.content)
+                for message in messages
+                if len(message.content.split()) >= MIN_PASSAGE_WORDS
+            ]
+            vectors = self.embedder.embed([text for *_, text in passages])
+
+            # The session's turns are replaced too. Chapters of one session share them and may be
+            # indexed at the same time, so indexing is serialized per session.
+            await session.execute(select(func.pg_advisory_xact_lock(func.hashtext(str(story.session_id)))))
+            await session.execute(
+                delete(MemoryEmbedding).where(
+                    MemoryEmbedding.session_id == story.session_id,
+                    or_(MemoryEmbedding.source_id == story_id, MemoryEmbedding.source_type == "message"),
+                )
+            )
+            if passages:
+                await session.execute(
+                    insert(MemoryEmbedding),
+                    [
+                        dict(
+                            memory_space_id=story.memory_space_id,
+                            session_id=story.session_id,
+                            source_type=source_type,
+                            source_id=source_id,
+                            chunk=chunk,
+                            text=text,
+                            embedder=self.embedder.name,
+                            vector=vector.tobytes(),
+                        )
+                        for (source_type, source_id, chunk, text), vector in zip(passages, vectors)
+                    ],
+                )
+            await session.commit()
+
+        self.cache.invalidate(story.memory_space_id)
+        return len(passages)
+
+    def _space(self, memory_space_id: UUID):
+        return (
+            MemoryEmbedding.memory_space_id == memory_space_id,
+            MemoryEmbedding.embedder == self.embedder.name,
+        )
+
+    async def _version(self, memory_space_id: UUID) -> tuple:
+        async with async_session() as session:
+            row = (await session.execute(
+                select(func.count(), func.max(MemoryEmbedding.created_at)).where(*self._space(memory_space_id))
+            )).one()
+        return tuple(row)
+
+    async def _load(self, memory_space_id: UUID) -> SpaceIndex:
+        async with async_session() as session:
+            rows = (await session.execute(
+                select(
+                    MemoryEmbedding.created_at,
+                    MemoryEmbedding.source_type,
+                    MemoryEmbedding.source_id,
+                    MemoryEmbedding.session_id,
+                    MemoryEmbedding.text,
+                    MemoryEmbedding.vector,
+                )
+                .where(*self._space(memory_space_id))
+                .order_by(MemoryEmbedding.source_id, MemoryEmbedding.chunk)
+            )).all()
+
+        matrix = np.frombuffer(b"".join(row.vector for row in rows), dtype=np.float32)
+        matrix = matrix.reshape(len(rows), self.embedder.dim)
+        weights = self.embedder.weights(matrix) if len(rows) else None
+        if weights is not None:
+            matrix = matrix * weights
+
+        sources: dict[UUID, int] = {}
+        sessions: dict[UUID, int] = {}
+        return SpaceIndex(
+            matrix=normalize(matrix),
+            weights=weights,
+            is_story=np.array([row.source_type == "story" for row in rows], dtype=bool),
+            source_codes=np.array([sources.setdefault(row.source_id, len(sources)) for row in rows], dtype=np.int32),
+            session_codes=np.array([sessions.setdefault(row.session_id, len(sessions)) for row in rows], dtype=np.int32),
+            sources=list(sources),
+            sessions=list(sessions),
+            texts=[row.text for row in rows],
+            version=(len(rows), max((row.created_at for row in rows), default=None)),
+        )
+
+    async def load(self, memory_space_id: UUID) -> SpaceIndex:
+        """The memory space's index, from the read cache unless its passages changed since."""
+        version = await self._version(memory_space_id)
+        index = await self.cache.get(memory_space_id, lambda: self._load(memory_space_id))
+        if index.version != version:
+            self.cache.invalidate(memory_space_id)
+            index = await self.cache.get(memory_space_id, lambda: self._load(memory_space_id))
+        return index
+
+    def query_vector(self, index: SpaceIndex, story_id: UUID, content: str) -> np.ndarray:
+        """Centroid of the story's indexed paragraphs, or its text embedded on the fly."""
+        code = index.code(index.sources, story_id)
+        if code >= 0:
+            vector = index.matrix[index.source_codes == code].sum(axis=0)
+        else:
+            vector = self.embedder.embed([content])[0]
+            if index.weights is not None:
+                vector = vector * index.weights
+        return normalize(vector)
+
+    async def related(
+        self,
+        memory_space_id: UUID,
+        story_id: UUID,
+        session_id: UUID,
+        content: str,
+        limit: int,
+    ) -> tuple[list[RelatedStoryHit], list[RelatedMomentHit]]:
+        """Stories and grandparent turns from other conversations most similar to a story.
+
+        Args:
+            memory_space_id: Memory space to search
+            story_id: The story to find neighbours for (excluded from results)
+            session_id: Its conversation (turns from it are excluded)
+            content: Story text, embedded if the story is not indexed yet
+            limit: Maximum number of stories and of moments
+
+        Returns:
+            Tuple of (stories, moments), best match first
+        """
+        index = await self.load(memory_space_id)
+        if not len(index.matrix):
+            return [], []
+
+        scores = index.matrix @ self.query_vector(index, story_id, content)
+        own_session = index.code(index.sessions, session_id)
+        # Below the threshold a match is mostly hash collisions and shared common words
+        candidates = (index.session_codes != own_session) & (scores >= settings.related_min_score)
+
+        # Stories score by their best matching paragraph
+        story_rows = np.flatnonzero(index.is_story & candidates)
+        best = np.full(len(index.sources), -np.inf, dtype=np.float32)
+        np.maximum.at(best, index.source_codes[story_rows], scores[story_rows])
+        stories = []
+        for code in top_k(best, limit):
+            rows = story_rows[index.source_codes[story_rows] == code]
+            row = rows[np.argmax(scores[rows])]
+            stories.append(RelatedStoryHit(index.sources[code], float(scores[row]), index.texts[row]))
+
+        message_rows = np.flatnonzero(~index.is_story & candidates)
+        moments = [
+            RelatedMomentHit(
+                message_id=index.sources[index.source_codes[row]],
+                session_id=index.sessions[index.session_codes[row]],
+                score=float(scores[row]),
+                text=index.texts[row],
+            )
+            for row in message_rows[top_k(scores[message_rows], limit)]
+        ]
+        return stories, moments
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest finite scores, highest first, without a full sort."""
+    candidates = np.flatnonzero(np.isfinite(scores))
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(scores[candidates], -k)[-k:]]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+async def index_all(batch_size: int = 200) -> int:
+    """Index every ready story (for existing data); returns the number of stories."""
+    related = RelatedIndex()
+    count = 0
+    last_id = None
+    while True:
+        query = select(Story.id).where(Story.status.in_(READY_STATUSES)).order_by(Story.id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(Story.id > last_id)
+        async with async_session() as session:
+            story_ids = (await session.execute(query)).scalars().all()
+        if not story_ids:
+            return count
+        for story_id in story_ids:
+            await related.index_story(story_id)
+        count += len(story_ids)
+        last_id = story_ids[-1]
+        logger.info(f"Indexed {count} stories for related memories")
@@ -18,6 +18,14 @@ class StoryGenerateResponse(BaseModel):
     status: str
 
 
+class StoryStatusResponse(BaseModel):
+    """Generation status of a story."""
+    story_id: UUID
+    title: str
+    status: str
+    error: Optional[str] = None
+
+
 class StoryDetail(BaseModel):
     """Detailed story information."""
     id: UUID
@@ -61,11 +69,55 @@ class UserStoryItem(BaseModel):
 
 
 class StoriesListResponse(BaseModel):
-    """Response with list of stories."""
+    """Response with a page of stories."""
     stories: List[StoryListItem]
-    total: int
+    total: Optional[int] = None  # Only when include_total is requested
+    next_cursor: Optional[str] = None  # None on the last page
 
 
 class UserStoriesResponse(BaseModel):
-    """Response with user's stories including full content."""
+    """Response with a page of user's stories including full content."""
     stories: List[UserStoryItem]
+    total: Optional[int] = None  # Only when include_total is requested
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+class StorySearchHit(BaseModel):
+    """Story matching a search, with highlighted snippet."""
+    id: UUID
+    title: str
+    snippet: str  # HTML-escaped text, matched words wrapped in <mark>
+    topic: str
+    rank: float
+    generated_at: str
+
+
+class StorySearchResponse(BaseModel):
+    """Response with a page of search results, best match first."""
+    results: List[StorySearchHit]
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+class RelatedStory(BaseModel):
+    """Another story of the memory space about similar things."""
+    id: UUID
+    title: str
+    excerpt: str
+    topic: str
+    score: float  # Cosine similarity of the best matching paragraph
+    passage: str  # That paragraph
+
+
+class RelatedMoment(BaseModel):
+    """Something the grandparent said in another conversation."""
+    session_id: UUID
+    message_id: UUID
+    text: str
+    score: float
+
+
+class RelatedResponse(BaseModel):
+    """Related stories and conversation moments, most similar first."""
+    story_id: UUID
+    stories: List[RelatedStory]
+    moments: List[RelatedMoment]
@@ -1,30 +1,62 @@
+import asyncio
+import logging
+import time
 from datetime import datetime, timezone
+from typing import Optional
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
-from sqlalchemy import select, func
+from fastapi import Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, select, func, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
-from database.postgres import get_db
+from config.settings import settings
+from database import search
+from database.postgres import async_session, get_db
+from libs.http_cache import cache_headers, is_not_modified, make_etag, not_modified_response
+from libs.metrics import STORY_GENERATION, track_stream
+from libs.sse import coalesce, sse_event, token_event
 from libs.story_agent.agent import StoryAgentFactory
-from libs.utils import extract_excerpt
+from libs.tracing import span
+from libs.utils import (
+    decode_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+    split_story_title,
+    story_content_fields,
+)
 from models import (
     Story,
     ConversationSession,
     ConversationMessage,
+    FamilyMember,
+    MemorySpace,
     SessionStatus,
     StoryStatus,
 )
+from models.story import READY_STATUSES
 from services.__base.acquire import Acquire
+from services.stories.chapters import CHAPTER_STYLE, segment_by_topic, topic_label
+from services.stories.related import RelatedIndex
 from services.stories.schema import (
+    RelatedMoment,
+    RelatedResponse,
+    RelatedStory,
     StoryGenerateRequest,
     StoryGenerateResponse,
+    StoryStatusResponse,
     StoryDetail,
     StoryListItem,
     StoriesListResponse,
+    StorySearchHit,
+    StorySearchResponse,
     UserStoryItem,
     UserStoriesResponse,
 )
+from services.stories.worker import StoryJobWorker
+
+logger = logging.getLogger(__name__)
 
 
 class StoriesService:
@@ -32,36 +64,352 @@ class StoriesService:
 
     http_exposed = [
         "post=generate",
+        "post=generate_stream",
+        "post=generate_chapters",
+        "get=status",
         "get=get_by_id",
         "get=get_by_memory_space",
         "get=get_by_email",
+        "get=search",
+        "get=related",
     ]
 
     def __init__(self, acquire: Acquire):
         """Initialize service."""
         self.acquire = acquire
         self.story_agent = StoryAgentFactory()
+        self.related_index = RelatedIndex()
+        self.worker = StoryJobWorker(self.story_agent, on_generated=self._index_related)
+
+    async def startup(self) -> None:
+        """Prime the story model's client, then start the background worker."""
+        if settings.warmup_llm:
+            try:
+                await self.story_agent.warmup()
+            except Exception as e:
+                logger.warning(f"Story agent warmup failed: {e}")
+        await self.worker.start()
+
+    async def shutdown(self) -> None:
+        """Stop the background story generation worker."""
+        await self.worker.stop()
 
     async def post_generate(
         self,
         request: StoryGenerateRequest,
         session: AsyncSession = Depends(get_db),
     ) -> StoryGenerateResponse:
-        """Generate a story from a conversation session.
+        """Queue story generation for a conversation session.
         
         Args:
             request: Story generation request
             session: Database session
             
         Returns:
-            StoryGenerateResponse with story_id and details
+            StoryGenerateResponse with story_id and pending status
         """
-        # Get conversation session
-        query = select(ConversationSession).where(
-            ConversationSession.id == request.session_id
+        story = await self._create_story_job(session, request.session_id, StoryStatus.PENDING)
+        with span("commit"):
+            await session.commit()
+        self.worker.notify()
+
+        return StoryGenerateResponse(
+            story_id=story.id,
+            title=story.title,
+            excerpt="",
+            status=story.status.value,
         )
-        result = await session.execute(query)
-        conversation_session = result.scalar_one_or_none()
+
+    async def post_generate_stream(
+        self,
+        request: StoryGenerateRequest,
+        session: AsyncSession = Depends(get_db),
+    ) -> StreamingResponse:
+        """Generate a story and stream its tokens as they are written.
+        
+        Uses the same metadata/token/done event protocol as the chat stream.
+        The story row is claimed up front and filled in once the stream
+        completes; if the client goes away mid-stream the background worker
+        picks the row up again after its lease expires.
+        
+        Args:
+            request: Story generation request
+            session: Database session
+            
+        Returns:
+            Streaming response with story tokens
+        """
+        story = await self._create_story_job(session, request.session_id, StoryStatus.GENERATING)
+        story.claimed_at = story.updated_at
+        story.attempts = 1
+        await session.commit()
+
+        story_id = story.id
+        session_id = request.session_id
+
+        # Load the transcript before streaming so the request connection is free
+        messages_query = (
+            select(ConversationMessage.role, ConversationMessage.content)
+            .where(ConversationMessage.session_id == session_id)
+            .order_by(ConversationMessage.sequence_number)
+        )
+        messages = (await session.execute(messages_query)).all()
+        await session.close()
+
+        async def generate():
+            started = time.perf_counter()
+            try:
+                metadata = {
+                    "type": "metadata",
+                    "story_id": str(story_id),
+                    "session_id": str(session_id),
+                    "status": StoryStatus.GENERATING.value,
+                }
+                yield sse_event(metadata)
+
+                story_parts = []
+
+                async def story_tokens():
+                    async for token in self.story_agent.stream_story(messages):
+                        if token.content:
+                            story_parts.append(token.content)
+                            yield token.content
+
+                # Batch tiny chunks into fewer frames
+                async for text in coalesce(story_tokens(), settings.sse_coalesce_ms / 1000, settings.sse_coalesce_max_chars):
+                    yield token_event(text)
+
+                # Persist once the full story has been received
+                title, content = split_story_title("".join(story_parts))
+                now = datetime.now(timezone.utc)
+                async with async_session() as write_session:
+                    await write_session.execute(
+                        update(Story)
+                        .where(Story.id == story_id)
+                        .values(
+                            title=title,
+                            **story_content_fields(content),
+                            status=StoryStatus.GENERATED,
+                            generated_at=now,
+                            updated_at=now,
+                            error=None,
+                        )
+                        .execution_options(synchronize_session=False)
+                    )
+                    await write_session.commit()
+                STORY_GENERATION.labels(mode="stream", outcome="success").observe(time.perf_counter() - started)
+                await self._index_related(story_id)
+
+                completion = {
+                    "type": "done",
+                    "story_id": str(story_id),
+                    "session_id": str(session_id),
+                    "title": title,
+                    "status": StoryStatus.GENERATED.value,
+                }
+                yield sse_event(completion)
+
+            except Exception as e:
+                STORY_GENERATION.labels(mode="stream", outcome="failure").observe(time.perf_counter() - started)
+                async with async_session() as write_session:
+                    await write_session.execute(
+                        update(Story)
+                        .where(Story.id == story_id)
+                        .values(
+                            status=StoryStatus.FAILED,
+                            error=str(e),
+                            updated_at=datetime.now(timezone.utc),
+                        )
+                        .execution_options(synchronize_session=False)
+                    )
+                    await write_session.commit()
+
+                error_data = {
+                    "type": "error",
+                    "message": str(e),
+                }
+                yield sse_event(error_data)
+
+        return StreamingResponse(
+            track_stream("story", generate()),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+            },
+        )
+
+    async def post_generate_chapters(
+        self,
+        request: StoryGenerateRequest,
+        session: AsyncSession = Depends(get_db),
+    ) -> StreamingResponse:
+        """Write a conversation up as one story per topic, concurrently.
+        
+        The transcript is split into consecutive topic segments and a
+        chapter story row is created for each. Chapters are generated at the
+        same time (at most ``settings.story_chapter_concurrency`` at once),
+        so the whole takes about as long as the longest chapter. A
+        ``chapter`` event is sent as each one finishes. A chapter that fails,
+        or is cut off by the client going away, is retried by the background
+        worker.
+        
+        Args:
+            request: Story generation request
+            session: Database session
+            
+        Returns:
+            Streaming response with metadata, chapter and done events
+        """
+        session_id = request.session_id
+        conversation_session = await self._completed_session(session_id)
+
+        existing_query = select(Story.status).where(Story.session_id == session_id)
+        existing = (await session.execute(existing_query)).scalars().all()
+        if any(story_status != StoryStatus.FAILED for story_status in existing):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Story already generated for this conversation",
+            )
+
+        messages_query = (
+            select(ConversationMessage.role, ConversationMessage.content)
+            .where(ConversationMessage.session_id == session_id)
+            .order_by(ConversationMessage.sequence_number)
+        )
+        chapters = segment_by_topic((await session.execute(messages_query)).all())
+        if not chapters:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Conversation has no messages",
+            )
+
+        # Failed attempts hold no content; the chapters replace them
+        if existing:
+            await session.execute(delete(Story).where(Story.session_id == session_id))
+        now = datetime.now(timezone.utc)
+        stories = [
+            Story(
+                memory_space_id=conversation_session.memory_space_id,
+                session_id=session_id,
+                title="Untitled Story",
+                content="",
+                topic=topic.value,
+                style=CHAPTER_STYLE,
+                status=StoryStatus.GENERATING,
+                generated_at=now,
+                updated_at=now,
+                claimed_at=now,
+                attempts=1,
+            )
+            for topic, _ in chapters
+        ]
+        session.add_all(stories)
+        await session.commit()
+        jobs = [(story.id, topic, chapter_messages) for story, (topic, chapter_messages) in zip(stories, chapters)]
+        await session.close()
+
+        semaphore = asyncio.Semaphore(settings.story_chapter_concurrency)
+
+        async def write_chapter(story_id: UUID, topic, chapter_messages) -> dict:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    story_content = await self.story_agent.generate_story(chapter_messages, topic_label(topic.value))
+                    title, content = split_story_title(story_content)
+                    STORY_GENERATION.labels(mode="chapter", outcome="success").observe(time.perf_counter() - started)
+                    finished = datetime.now(timezone.utc)
+                    values = dict(
+                        title=title,
+                        **story_content_fields(content),
+                        status=StoryStatus.GENERATED,
+                        generated_at=finished,
+                        updated_at=finished,
+                        error=None,
+                    )
+                except Exception as e:
+                    logger.error(f"Chapter {story_id} ({topic.value}) failed: {e}")
+                    STORY_GENERATION.labels(mode="chapter", outcome="failure").observe(time.perf_counter() - started)
+                    # Left to the background worker, which retries up to story_job_max_attempts
+                    values = dict(
+                        status=StoryStatus.PENDING,
+                        error=str(e),
+                        updated_at=datetime.now(timezone.utc),
+                    )
+
+            async with async_session() as write_session:
+                await write_session.execute(
+                    update(Story)
+                    .where(Story.id == story_id, Story.status == StoryStatus.GENERATING)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                await write_session.commit()
+            if values["status"] == StoryStatus.GENERATED:
+                await self._index_related(story_id)
+            else:
+                self.worker.notify()
+
+            event = {
+                "type": "chapter",
+                "story_id": str(story_id),
+                "topic": topic.value,
+                "status": values["status"].value,
+            }
+            if "title" in values:
+                event["title"] = values["title"]
+            else:
+                event["error"] = values["error"]
+            return event
+
+        async def generate():
+            metadata = {
+                "type": "metadata",
+                "session_id": str(session_id),
+                "status": StoryStatus.GENERATING.value,
+                "chapters": [{"story_id": str(story_id), "topic": topic.value} for story_id, topic, _ in jobs],
+            }
+            yield sse_event(metadata)
+
+            tasks = [asyncio.create_task(write_chapter(*job)) for job in jobs]
+            try:
+                generated = 0
+                # Progress is reported in the order chapters finish
+                for completed, next_chapter in enumerate(asyncio.as_completed(tasks), 1):
+                    event = await next_chapter
+                    generated += event["status"] == StoryStatus.GENERATED.value
+                    yield sse_event({**event, "completed": completed, "total": len(tasks)})
+
+                completion = {
+                    "type": "done",
+                    "session_id": str(session_id),
+                    "generated": generated,
+                    "total": len(tasks),
+                }
+                yield sse_event(completion)
+            finally:
+                # Client went away: unfinished chapters are picked up after their lease
+                for task in tasks:
+                    task.cancel()
+
+        return StreamingResponse(
+            track_stream("chapters", generate()),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+            },
+        )
+
+    async def _completed_session(self, session_id: UUID) -> ConversationSession:
+        """Load a conversation session that a story can be written from.
+        
+        Raises:
+            HTTPException: 404 if it doesn't exist, 400 if it isn't completed
+        """
+        # Get conversation session (cached once completed)
+        with span("session_lookup"):
+            conversation_session = await ConversationSession.read_current(session_id)
 
         if not conversation_session:
             raise HTTPException(
@@ -75,11 +423,40 @@ class StoriesService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot generate story from incomplete conversation",
             )
+        return conversation_session
+
+    async def _create_story_job(
+        self,
+        session: AsyncSession,
+        session_id: UUID,
+        story_status: StoryStatus,
+    ) -> Story:
+        """Validate a conversation and create (or re-queue) its story row.
+        
+        Args:
+            session: Database session
+            session_id: Conversation session ID
+            story_status: Initial status of the story row
+            
+        Returns:
+            The uncommitted Story row
+        """
+        conversation_session = await self._completed_session(session_id)
 
         # Check if story already exists for this session
-        existing_query = select(Story).where(Story.session_id == request.session_id)
-        existing_result = await session.execute(existing_query)
-        existing_story = existing_result.scalar_one_or_none()
+        existing_query = select(Story).where(Story.session_id == session_id)
+        with span("existing_story"):
+            existing_result = await session.execute(existing_query)
+        existing_story = existing_result.scalars().first()
+
+        now = datetime.now(timezone.utc)
+        if existing_story and existing_story.status == StoryStatus.FAILED and existing_story.style != CHAPTER_STYLE:
+            # Re-queue a failed generation instead of rejecting it
+            existing_story.status = story_status
+            existing_story.attempts = 0
+            existing_story.error = None
+            existing_story.updated_at = now
+            return existing_story
 
         if existing_story:
             raise HTTPException(
@@ -87,78 +464,83 @@ class StoriesService:
                 detail="Story already generated for this conversation",
             )
 
-        # Get all messages from the conversation
-        messages_query = (
-            select(ConversationMessage)
-            .where(ConversationMessage.session_id == request.session_id)
-            .order_by(ConversationMessage.sequence_number)
-        )
-        messages_result = await session.execute(messages_query)
-        messages = messages_result.scalars().all()
-
-        # Format transcript for story generation
-        transcript_lines = []
-        for msg in messages:
-            # USER = grandparent's messages, ASSISTANT = AI interviewer
-            role = "Grandparent" if msg.role == "user" else "Grandchild"
-            transcript_lines.append(f"{role}: {msg.content}")
-        
-        transcript = "\n\n".join(transcript_lines)
-
-        # Generate story using story agent
-        story_content = self.story_agent.generate_story(transcript)
-
-        # Extract title from content (assuming first line or heading is title)
-        lines = story_content.strip().split("\n")
-        title = lines[0].strip().strip("#").strip() if lines else "Untitled Story"
-        
-        # Remove title from content if it's in the first line
-        if lines and (lines[0].startswith("#") or len(lines[0]) < 100):
-            content = "\n".join(lines[1:]).strip()
-        else:
-            content = story_content
-
-        # Create story record
-        now = datetime.now(timezone.utc)
+        # Title and content are filled in once generation finishes
         story = Story(
             memory_space_id=conversation_session.memory_space_id,
-            session_id=request.session_id,
-            title=title,
-            content=content,
+            session_id=session_id,
+            title="Untitled Story",
+            content="",
             topic=conversation_session.topic.value,
             style="narrative",
-            status=StoryStatus.GENERATED,
+            status=story_status,
             generated_at=now,
             updated_at=now,
         )
         session.add(story)
-        await session.commit()
-        await session.refresh(story)
+        with span("insert_story"):
+            await session.flush()
+        return story
 
-        # Create excerpt
-        excerpt = extract_excerpt(content, words=50)
+    async def get_status(
+        self,
+        story_id: UUID,
+        session: AsyncSession = Depends(get_db),
+    ) -> StoryStatusResponse:
+        """Get the generation status of a story.
+        
+        Args:
+            story_id: Story ID returned by generate
+            session: Database session
+            
+        Returns:
+            StoryStatusResponse with current job status
+        """
+        query = select(Story.id, Story.title, Story.status, Story.error).where(Story.id == story_id)
+        result = await session.execute(query)
+        row = result.first()
 
-        return StoryGenerateResponse(
-            story_id=story.id,
-            title=story.title,
-            excerpt=excerpt,
-            status=story.status.value,
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Story not found",
+            )
+
+        return StoryStatusResponse(
+            story_id=row.id,
+            title=row.title,
+            status=row.status.value,
+            error=row.error,
         )
 
     async def get_get_by_id(
         self,
         story_id: UUID,
+        request: Request,
+        response: Response,
         session: AsyncSession = Depends(get_db),
     ) -> StoryDetail:
         """Get a specific story by ID.
         
+        Conditional requests are answered with 304 after reading only the
+        story's validators, without loading its content.
+        
         Args:
             story_id: Story ID
+            request: Incoming request (for If-None-Match / If-Modified-Since)
+            response: Outgoing response (for caching headers)
             session: Database session
             
         Returns:
             StoryDetail with complete story information
         """
+        if "if-none-match" in request.headers or "if-modified-since" in request.headers:
+            validators_query = select(Story.updated_at, Story.status).where(Story.id == story_id)
+            validators = (await session.execute(validators_query)).first()
+            if validators:
+                headers = self._story_cache_headers(story_id, validators.updated_at, validators.status)
+                if is_not_modified(request, headers["ETag"], validators.updated_at):
+                    return not_modified_response(headers)
+
         query = select(Story).where(Story.id == story_id)
         result = await session.execute(query)
         story = result.scalar_one_or_none()
@@ -169,6 +551,7 @@ class StoriesService:
                 detail="Story not found",
             )
 
+        response.headers.update(self._story_cache_headers(story.id, story.updated_at, story.status))
         return StoryDetail(
             id=story.id,
             title=story.title,
@@ -184,39 +567,64 @@ class StoriesService:
     async def get_get_by_memory_space(
         self,
         space_id: UUID,
+        request: Request,
+        response: Response,
+        limit: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = None,
+        include_total: bool = False,
         session: AsyncSession = Depends(get_db),
     ) -> StoriesListResponse:
-        """Get all stories for a memory space.
+        """Get a page of stories for a memory space, newest first.
+        
+        The ETag covers exactly what the page shows (each story's id and
+        updated_at, the total and the next cursor), so a matching
+        If-None-Match gets a 304 without the page being serialized.
         
         Args:
             space_id: Memory space ID
+            request: Incoming request (for If-None-Match)
+            response: Outgoing response (for caching headers)
+            limit: Maximum number of stories to return
+            cursor: next_cursor from the previous page
+            include_total: Also count all stories (extra query)
             session: Database session
             
         Returns:
-            StoriesListResponse with list of stories
+            StoriesListResponse with a page of stories
         """
-        # Get all stories for the memory space
+        filters = (Story.memory_space_id == space_id, Story.status.in_(READY_STATUSES))
+        # Lightweight columns only; content is never read for listings
         query = (
             select(Story)
-            .where(Story.memory_space_id == space_id)
-            .order_by(Story.generated_at.desc())
+            .options(load_only(
+                Story.id, Story.title, Story.excerpt, Story.topic, Story.status,
+                Story.generated_at, Story.updated_at,
+            ))
+            .where(*filters)
         )
-        result = await session.execute(query)
-        stories = result.scalars().all()
+        stories, next_cursor = await self._paginate(session, query, cursor, limit)
 
-        # Get total count
-        count_query = select(func.count(Story.id)).where(
-            Story.memory_space_id == space_id
+        total = None
+        if include_total:
+            count_query = select(func.count(Story.id)).where(*filters)
+            count_result = await session.execute(count_query)
+            total = count_result.scalar()
+
+        # New stories land on the first page, so listings are always revalidated
+        headers = cache_headers(
+            make_etag(space_id, total, next_cursor, *((story.id, story.updated_at) for story in stories)),
+            cache_control="public, no-cache",
         )
-        count_result = await session.execute(count_query)
-        total = count_result.scalar()
+        if is_not_modified(request, headers["ETag"]):
+            return not_modified_response(headers)
+        response.headers.update(headers)
 
         return StoriesListResponse(
             stories=[
                 StoryListItem(
                     id=story.id,
                     title=story.title,
-                    excerpt=extract_excerpt(story.content, words=50),
+                    excerpt=story.excerpt,
                     topic=story.topic,
                     status=story.status.value,
                     generated_at=story.generated_at.isoformat(),
@@ -224,41 +632,46 @@ class StoriesService:
                 for story in stories
             ],
             total=total,
+            next_cursor=next_cursor,
         )
 
     async def get_get_by_email(
         self,
         email: str,
+        limit: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = None,
+        include_total: bool = False,
         session: AsyncSession = Depends(get_db),
     ) -> UserStoriesResponse:
-        """Get all memory blogs for a user by their email.
+        """Get a page of memory blogs for a user by their email, newest first.
         
         Args:
             email: User's email address
+            limit: Maximum number of stories to return
+            cursor: next_cursor from the previous page
+            include_total: Also count all stories (extra query)
             session: Database session
             
         Returns:
-            UserStoriesResponse with list of stories including full content
+            UserStoriesResponse with a page of stories including full content
         """
-        from models import FamilyMember, MemorySpace
-        
-        # Find all memory spaces where user is a family member
-        query = select(FamilyMember.memory_space_id).where(FamilyMember.email == email)
-        result = await session.execute(query)
-        memory_space_ids = [row[0] for row in result.all()]
+        # Memory spaces where user is a family member
+        memory_space_ids = select(FamilyMember.memory_space_id).where(FamilyMember.email == email)
+        filters = (Story.memory_space_id.in_(memory_space_ids), Story.status.in_(READY_STATUSES))
 
-        if not memory_space_ids:
-            return UserStoriesResponse(stories=[])
-
-        # Get all stories for these memory spaces with memory space details
+        # Stories for these memory spaces with memory space details
         query = (
-            select(Story, MemorySpace)
+            select(Story, MemorySpace.grandparent_name)
             .join(MemorySpace, Story.memory_space_id == MemorySpace.id)
-            .where(Story.memory_space_id.in_(memory_space_ids))
-            .order_by(Story.generated_at.desc())
+            .where(*filters)
         )
-        result = await session.execute(query)
-        rows = result.all()
+        rows, next_cursor = await self._paginate(session, query, cursor, limit, scalars=False)
+
+        total = None
+        if include_total:
+            count_query = select(func.count(Story.id)).where(*filters)
+            count_result = await session.execute(count_query)
+            total = count_result.scalar()
 
         return UserStoriesResponse(
             stories=[
@@ -266,10 +679,219 @@ class StoriesService:
                     id=story.id,
                     title=story.title,
                     content=story.content,  # Full markdown content
-                    grandparent_name=memory_space.grandparent_name,
+                    grandparent_name=grandparent_name,
                     topic=story.topic,
                     generated_at=story.generated_at.isoformat(),
                 )
-                for story, memory_space in rows
+                for story, grandparent_name in rows
+            ],
+            total=total,
+            next_cursor=next_cursor,
+        )
+
+    async def get_search(
+        self,
+        space_id: UUID,
+        q: str = Query(..., min_length=1, max_length=200),
+        limit: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = None,
+        session: AsyncSession = Depends(get_db),
+    ) -> StorySearchResponse:
+        """Search a memory space's stories by title and content, best match first.
+        
+        Args:
+            space_id: Memory space ID
+            q: Search text; supports "quoted phrases", OR and -excluded words
+            limit: Maximum number of results to return
+            cursor: next_cursor from the previous page
+            session: Database session
+            
+        Returns:
+            StorySearchResponse with ranked, highlighted results
+        """
+        tsquery = search.parse_query(q)
+        rank = search.rank(Story.search_vector, tsquery)
+        page = (
+            select(Story.id, rank.label("rank"))
+            .where(
+                Story.memory_space_id == space_id,
+                Story.status.in_(READY_STATUSES),
+                search.matches(Story.search_vector, tsquery),
+            )
+        )
+        if cursor:
+            try:
+                page = page.where(search.after_cursor(rank, Story.id, cursor))
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor",
+                )
+        # Fetch one extra row to know whether another page exists
+        page = page.order_by(rank.desc(), Story.id.desc()).limit(limit + 1).subquery()
+
+        # Snippets are only built for the rows of this page
+        query = (
+            select(
+                Story.id, Story.title, Story.topic, Story.generated_at, page.c.rank,
+                search.headline(Story.content, tsquery).label("snippet"),
+            )
+            .join(page, page.c.id == Story.id)
+            .order_by(page.c.rank.desc(), Story.id.desc())
+        )
+        rows = (await session.execute(query)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].id)
+
+        return StorySearchResponse(
+            results=[
+                StorySearchHit(
+                    id=row.id,
+                    title=row.title,
+                    snippet=search.render_headline(row.snippet),
+                    topic=row.topic,
+                    rank=row.rank,
+                    generated_at=row.generated_at.isoformat(),
+                )
+                for row in rows
+            ],
+            next_cursor=next_cursor,
+        )
+
+    async def get_related(
+        self,
+        story_id: UUID,
+        limit: int = Query(5, ge=1, le=20),
+        session: AsyncSession = Depends(get_db),
+    ) -> RelatedResponse:
+        """Find stories and conversation moments of the same memory space similar to a story.
+        
+        Args:
+            story_id: Story ID
+            limit: Maximum number of stories and of moments to return
+            session: Database session
+            
+        Returns:
+            RelatedResponse with related stories and moments, most similar first
+        """
+        story = (await session.execute(
+            select(Story.memory_space_id, Story.session_id, Story.content).where(Story.id == story_id)
+        )).first()
+        if not story:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Story not found",
+            )
+
+        with span("related"):
+            hits, moments = await self.related_index.related(
+                story.memory_space_id, story_id, story.session_id, story.content, limit
+            )
+
+        # Titles come from the stories table; stories no longer ready are dropped
+        stories = {}
+        if hits:
+            rows = await session.execute(
+                select(Story.id, Story.title, Story.excerpt, Story.topic).where(
+                    Story.id.in_([hit.story_id for hit in hits]),
+                    Story.status.in_(READY_STATUSES),
+                )
+            )
+            stories = {row.id: row for row in rows}
+
+        return RelatedResponse(
+            story_id=story_id,
+            stories=[
+                RelatedStory(
+                    id=hit.story_id,
+                    title=stories[hit.story_id].title,
+                    excerpt=stories[hit.story_id].excerpt,
+                    topic=stories[hit.story_id].topic,
+                    score=hit.score,
+                    passage=hit.passage,
+                )
+                for hit in hits
+                if hit.story_id in stories
+            ],
+            moments=[
+                RelatedMoment(
+                    session_id=moment.session_id,
+                    message_id=moment.message_id,
+                    text=moment.text,
+                    score=moment.score,
+                )
+                for moment in moments
             ],
         )
+
+    async def _index_related(self, story_id: UUID) -> None:
+        """Add a freshly generated story to the related-memories index."""
+        try:
+            await self.related_index.index_story(story_id)
+        except Exception as e:
+            logger.warning(f"Related index update failed for story {story_id}: {e}")
+
+    def _story_cache_headers(
+        self,
+        story_id: UUID,
+        updated_at: datetime,
+        story_status: StoryStatus,
+    ) -> dict[str, str]:
+        """Caching headers for a single story.
+        
+        Finished stories may be served from a shared cache for a while;
+        stories still being generated must always be revalidated.
+        """
+        if story_status in READY_STATUSES:
+            cache_control = (
+                f"public, max-age={settings.http_cache_max_age}, "
+                f"stale-while-revalidate={settings.http_cache_stale_while_revalidate}"
+            )
+        else:
+            cache_control = "no-cache"
+        return cache_headers(make_etag(story_id, updated_at, story_status.value), updated_at, cache_control)
+
+    async def _paginate(
+        self,
+        session: AsyncSession,
+        query,
+        cursor: Optional[str],
+        limit: int,
+        scalars: bool = True,
+    ) -> tuple[list, Optional[str]]:
+        """Apply (generated_at, id) keyset pagination to a Story query.
+        
+        Args:
+            session: Database session
+            query: Select whose first entity is Story
+            cursor: Opaque cursor from a previous page
+            limit: Page size
+            scalars: Return Story objects instead of rows
+            
+        Returns:
+            Tuple of (items, next_cursor)
+        """
+        if cursor:
+            try:
+                generated_at, story_id = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor",
+                )
+            query = query.where(tuple_(Story.generated_at, Story.id) < (generated_at, story_id))
+
+        # Fetch one extra row to know whether another page exists
+        query = query.order_by(Story.generated_at.desc(), Story.id.desc()).limit(limit + 1)
+        result = await session.execute(query)
+        items = list(result.scalars().all() if scalars else result.all())
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1] if scalars else items[-1][0]
+            next_cursor = encode_cursor(last.generated_at, last.id)
+        return items, next_cursor
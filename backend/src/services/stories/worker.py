@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from sqlalchemy import and_, or_, select, update
+
+from config.settings import settings
+from database.postgres import async_session
+from libs.metrics import STORY_GENERATION
+from libs.story_agent.agent import StoryAgentFactory
+from libs.utils import split_story_title, story_content_fields
+from models import ConversationMessage, Story, StoryStatus
+from services.stories.chapters import CHAPTER_STYLE, segment_by_topic, topic_label
+
+logger = logging.getLogger(__name__)
+
+
+class StoryJobWorker:
+    """Background worker that generates pending stories.
+
+    Jobs are ``stories`` rows in ``PENDING`` status. Workers in every process
+    claim them with ``SELECT ... FOR UPDATE SKIP LOCKED`` so a job is only
+    picked up once, and a claim that outlives its lease (crashed worker) is
+    picked up again. ``on_generated`` is awaited with the story id after a
+    story was saved.
+    """
+
+    def __init__(
+        self,
+        story_agent: StoryAgentFactory,
+        on_generated: Callable[[UUID], Awaitable[None]] | None = None,
+    ):
+        self.story_agent = story_agent
+        self.on_generated = on_generated
+        self.concurrency = settings.story_worker_concurrency
+        self.poll_interval = settings.story_worker_poll_interval
+        self.lease = timedelta(seconds=settings.story_job_lease_seconds)
+        self.max_attempts = settings.story_job_max_attempts
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Start the worker loops."""
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        """Cancel the worker loops; claimed jobs are retried after their lease."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers after a job was enqueued in this process."""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                job = await self._claim()
+            except Exception as e:
+                logger.error(f"Failed to claim story job: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._process(*job)
+            except Exception as e:
+                logger.error(f"Failed to record story job {job[0]}: {e}")
+
+    async def _claim(self) -> tuple[UUID, UUID, int, str, str] | None:
+        """Atomically move the oldest available job to GENERATING."""
+        now = datetime.now(timezone.utc)
+        candidate = (
+            select(Story.id)
+            .where(
+                or_(
+                    Story.status == StoryStatus.PENDING,
+                    and_(
+                        Story.status == StoryStatus.GENERATING,
+                        Story.claimed_at < now - self.lease,
+                    ),
+                )
+            )
+            .order_by(Story.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        query = (
+            update(Story)
+            .where(Story.id == candidate)
+            .values(
+                status=StoryStatus.GENERATING,
+                claimed_at=now,
+                attempts=Story.attempts + 1,
+            )
+            .returning(Story.id, Story.session_id, Story.attempts, Story.topic, Story.style)
+            .execution_options(synchronize_session=False)
+        )
+        async with async_session() as session:
+            result = await session.execute(query)
+            row = result.first()
+            await session.commit()
+        return tuple(row) if row else None
+
+    async def _process(self, story_id: UUID, session_id: UUID, attempts: int, topic: str, style: str) -> None:
+        started = time.perf_counter()
+        try:
+            async with async_session() as session:
+                messages_query = (
+                    select(ConversationMessage.role, ConversationMessage.content)
+                    .where(ConversationMessage.session_id == session_id)
+                    .order_by(ConversationMessage.sequence_number)
+                )
+                messages = (await session.execute(messages_query)).all()
+
+            chapter = None
+            if style == CHAPTER_STYLE:
+                # Chapters are re-derived from the transcript, the same way they were first split
+                chapter = topic_label(topic)
+                messages = next((part for t, part in segment_by_topic(messages) if t.value == topic), messages)
+
+            # No connection is held while the LLM runs
+            story_content = await self.story_agent.generate_story(messages, chapter)
+            title, content = split_story_title(story_content)
+            STORY_GENERATION.labels(mode="job", outcome="success").observe(time.perf_counter() - started)
+
+            now = datetime.now(timezone.utc)
+            values = dict(
+                title=title,
+                **story_content_fields(content),
+                status=StoryStatus.GENERATED,
+                generated_at=now,
+                updated_at=now,
+                error=None,
+            )
+        except Exception as e:
+            logger.error(f"Story job {story_id} failed (attempt {attempts}): {e}")
+            STORY_GENERATION.labels(mode="job", outcome="failure").observe(time.perf_counter() - started)
+            failed = attempts >= self.max_attempts
+            values = dict(
+                status=StoryStatus.FAILED if failed else StoryStatus.PENDING,
+                error=str(e),
+                updated_at=datetime.now(timezone.utc),
+            )
+
+        async with async_session() as session:
+            result = await session.execute(
+                update(Story)
+                .where(Story.id == story_id, Story.status == StoryStatus.GENERATING)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+        if self.on_generated and result.rowcount and values["status"] == StoryStatus.GENERATED:
+            await self.on_generated(story_id)
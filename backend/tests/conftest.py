@@ -0,0 +1,47 @@
+"""Shared test setup.
+
+Tests run against a real, migrated Postgres given by ``DATABASE_URL``
+(``alembic upgrade head`` first) and are skipped when it isn't reachable.
+The app is built once per test run with a deliberately small connection
+pool and the offline fake LLM provider, so settings are fixed here,
+before anything imports ``config.settings``.
+"""
+import os
+
+import pytest
+from dotenv import load_dotenv
+
+load_dotenv()
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ["DB_POOL_SIZE"] = "2"
+os.environ["DB_MAX_OVERFLOW"] = "0"
+os.environ["DB_POOL_TIMEOUT"] = "2"
+os.environ["LLM_PROVIDER"] = "fake"
+# Short fake responses keep tests that run the real agents fast
+os.environ["FAKE_LLM_TTFT_MS"] = "10"
+os.environ["FAKE_LLM_TOKEN_DELAY_MS"] = "1"
+os.environ["FAKE_LLM_TOKENS"] = "20"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def database():
+    """The async engine, or skip the test when Postgres isn't reachable."""
+    if not os.environ.get("DATABASE_URL"):
+        pytest.skip("DATABASE_URL is not set")
+
+    from sqlalchemy import text
+
+    from database.postgres import async_engine
+
+    try:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except OSError as e:
+        pytest.skip(f"Postgres not available: {e}")
+    yield async_engine
+    await async_engine.dispose()
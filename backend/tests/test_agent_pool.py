@@ -0,0 +1,38 @@
+import json
+import uuid
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def chat(client: httpx.AsyncClient, body: dict) -> list[dict]:
+    async with client.stream("POST", "/api/conversations/chat", json=body) as response:
+        assert response.status_code == 200
+        return [json.loads(line[6:]) async for line in response.aiter_lines() if line.startswith("data: ")]
+
+
+async def test_health_reports_agent_reuse(database):
+    """A session's second turn reuses its pooled agent, as counted in /health."""
+    from app import app
+    from models import MemorySpace
+
+    memory_space = await MemorySpace(
+        grandparent_name="Rose", relation="grandmother", access_token=str(uuid.uuid4())
+    ).create()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+        before = (await client.get("/health")).json()["services"]["conversations"]["agent_pool"]
+        first = await chat(client, {"memory_space_id": str(memory_space.id), "user_message": "Hello"})
+        session_id = first[0]["session_id"]
+        second = await chat(
+            client,
+            {"memory_space_id": str(memory_space.id), "session_id": session_id, "user_message": "We had a farm."},
+        )
+        after = (await client.get("/health")).json()["services"]["conversations"]["agent_pool"]
+
+    assert first[-1]["type"] == "done" and second[-1]["type"] == "done", (first[-1], second[-1])
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
@@ -0,0 +1,54 @@
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+STREAMS = 40
+TOKENS = ["Tell ", "me ", "more ", "about ", "that."]
+TOKEN_DELAY = 0.1
+
+
+async def slow_chat(self, chat_session_id, grandparent_name, message, memory_size=None, summary=None):
+    """Agent stand-in that streams for about half a second per turn."""
+    for token in TOKENS:
+        await asyncio.sleep(TOKEN_DELAY)
+        yield SimpleNamespace(content=token)
+
+
+async def chat(client: httpx.AsyncClient, memory_space_id: uuid.UUID) -> list[dict]:
+    body = {"memory_space_id": str(memory_space_id), "user_message": "We lived by the river."}
+    async with client.stream("POST", "/api/conversations/chat", json=body) as response:
+        assert response.status_code == 200
+        return [json.loads(line[6:]) async for line in response.aiter_lines() if line.startswith("data: ")]
+
+
+async def test_many_chat_streams_share_a_small_pool(database, monkeypatch):
+    """Streams hold no connection while tokens flow, so 2 connections serve 40 of them.
+
+    Held for a whole stream, the pool would serve 2 at a time and the rest
+    would hit the 2 s pool timeout long before the last ones got a connection.
+    """
+    from app import app
+    from libs.conversation_agent.agent import ConversationAgentFactory
+    from models import MemorySpace
+
+    assert database.pool.size() == 2 and database.pool._max_overflow == 0
+    monkeypatch.setattr(ConversationAgentFactory, "chat", slow_chat)
+    memory_space = await MemorySpace(
+        grandparent_name="Rose", relation="grandmother", access_token=str(uuid.uuid4())
+    ).create()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+        results = await asyncio.gather(*(chat(client, memory_space.id) for _ in range(STREAMS)))
+
+    for events in results:
+        assert events[0]["type"] == "metadata"
+        assert events[-1]["type"] == "done", events[-1]
+        assert "".join(e["content"] for e in events if e["type"] == "token") == "".join(TOKENS)
+    assert len({events[0]["session_id"] for events in results}) == STREAMS
@@ -0,0 +1,55 @@
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+# Includes the private-use characters search.py marks matches with; they must not become <mark>
+MESSAGE = "We kept <img src=x onerror=alert(1)> goats on the farm & \ue000sold\ue001 the milk."
+
+
+async def seed_space():
+    from database.postgres import async_session
+    from models import (
+        ConversationMessage, ConversationSession, MemorySpace, SessionStatus, Story, StoryStatus, TopicEnum,
+    )
+
+    now = datetime.now(timezone.utc)
+    async with async_session() as session:
+        memory_space = MemorySpace(grandparent_name="Rose", relation="grandmother", access_token=str(uuid.uuid4()))
+        session.add(memory_space)
+        await session.flush()
+        conversation = ConversationSession(
+            memory_space_id=memory_space.id, topic=TopicEnum.CHILDHOOD, status=SessionStatus.COMPLETED,
+            input_mode="text", started_at=now,
+        )
+        session.add(conversation)
+        await session.flush()
+        session.add(ConversationMessage(session_id=conversation.id, role="user", content=MESSAGE, sequence_number=1))
+        session.add(Story(
+            memory_space_id=memory_space.id, session_id=conversation.id, title="Goats", content=MESSAGE,
+            topic=TopicEnum.CHILDHOOD.value, status=StoryStatus.GENERATED, generated_at=now, updated_at=now,
+        ))
+        await session.commit()
+        return memory_space.id
+
+
+@pytest.mark.parametrize("path", ["/api/stories/search", "/api/conversations/search"])
+async def test_search_snippets_are_escaped(database, path):
+    """Stored text is HTML-escaped in snippets; only the highlight is markup."""
+    from app import app
+
+    memory_space_id = await seed_space()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(path, params={"space_id": str(memory_space_id), "q": "goats"})
+
+    assert response.status_code == 200
+    snippet = response.json()["results"][0]["snippet"]
+    assert "<img" not in snippet
+    assert "&lt;img src=x onerror=alert(1)&gt;" in snippet
+    assert "<mark>goats</mark>" in snippet
+    assert snippet.count("<mark>") == 1 and snippet.count("</mark>") == 1
+    assert "farm &amp;" in snippet
@@ -0,0 +1,43 @@
+import json
+import logging
+import os
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+async def test_sampled_request_is_logged():
+    """With the app's own logging setup, a sampled request emits its trace record."""
+    if not os.environ.get("DATABASE_URL"):
+        pytest.skip("DATABASE_URL is not set")
+    from app import app
+    from libs.tracing import logger
+    from middleware.tracing import TracingMiddleware
+
+    # app.py must have given the logger an output and the INFO level; the root default drops it
+    assert logger.handlers and logger.isEnabledFor(logging.INFO)
+    captured = Records()
+    logger.addHandler(captured)
+    try:
+        transport = httpx.ASGITransport(app=TracingMiddleware(app, sample_rate=1.0))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/", headers={"X-Request-ID": "trace-test-1"})
+    finally:
+        logger.removeHandler(captured)
+
+    assert response.status_code == 200
+    traces = [json.loads(record.getMessage()) for record in captured.records]
+    assert [(trace["event"], trace["request_id"], trace["method"]) for trace in traces] == [
+        ("request_trace", "trace-test-1", "GET")
+    ]
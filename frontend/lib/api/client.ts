@@ -361,7 +361,30 @@ export async function convertSessionToBlog({
     throw new Error(error.detail || "Failed to generate story");
   }
 
-  return response.json();
+  // Generation runs in the background; poll until the story is ready
+  const job = await response.json();
+  const storyId: string = job.story_id;
+  let status: string = job.status;
+
+  while (status === "pending" || status === "generating") {
+    await new Promise((resolve) => setTimeout(resolve, 2000));
+    const statusResponse = await fetch(
+      `${API_URL}/stories/status?story_id=${storyId}`
+    );
+
+    if (!statusResponse.ok) {
+      throw new Error("Failed to get story status");
+    }
+
+    const statusData = await statusResponse.json();
+    status = statusData.status;
+
+    if (status === "failed") {
+      throw new Error(statusData.error || "Failed to generate story");
+    }
+  }
+
+  return getStoryById(storyId);
 }
 
 export async function getStoryById(storyId: string): Promise<Story> {
@@ -376,32 +399,46 @@ export async function getStoryById(storyId: string): Promise<Story> {
   return response.json();
 }
 
-export async function getUserBlogs(email: string): Promise<Story[]> {
-  const response = await fetch(
-    `${API_URL}/stories/get_by_email?email=${encodeURIComponent(email)}`
-  );
+// Story listings are cursor-paginated; follow next_cursor to collect every page
+async function fetchAllStoryPages(
+  url: string,
+  errorMessage: string
+): Promise<Story[]> {
+  const stories: Story[] = [];
+  let cursor: string | null = null;
 
-  if (!response.ok) {
-    throw new Error("Failed to get user stories");
-  }
+  do {
+    const pageUrl: string = cursor
+      ? `${url}&cursor=${encodeURIComponent(cursor)}`
+      : url;
+    const response = await fetch(pageUrl);
 
-  const data = await response.json();
-  return data.stories || [];
+    if (!response.ok) {
+      throw new Error(errorMessage);
+    }
+
+    const data = await response.json();
+    stories.push(...(data.stories || []));
+    cursor = data.next_cursor || null;
+  } while (cursor);
+
+  return stories;
+}
+
+export async function getUserBlogs(email: string): Promise<Story[]> {
+  return fetchAllStoryPages(
+    `${API_URL}/stories/get_by_email?email=${encodeURIComponent(email)}&limit=100`,
+    "Failed to get user stories"
+  );
 }
 
 export async function getMemorySpaceStories(
   memorySpaceId: string
 ): Promise<Story[]> {
-  const response = await fetch(
-    `${API_URL}/stories/get_by_memory_space?memory_space_id=${memorySpaceId}`
+  return fetchAllStoryPages(
+    `${API_URL}/stories/get_by_memory_space?memory_space_id=${memorySpaceId}&limit=100`,
+    "Failed to get memory space stories"
   );
-
-  if (!response.ok) {
-    throw new Error("Failed to get memory space stories");
-  }
-
-  const data = await response.json();
-  return data.stories || [];
 }
 
 // Photo upload placeholder